@@ -3,7 +3,6 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
-import itertools
 from utils import combo_filters, lottery_stats, pool_select, viz
 
 # === CONFIGURATION ===
@@ -27,44 +26,31 @@ print(f"Hot numbers: {hot_numbers}")
 print(f"Cold numbers: {cold_numbers}")
 print(f"Warm numbers: {warm_numbers[:10]}... ({len(warm_numbers)} total)")
 
-# === GENERATE ALL PICK 5 COMBOS: 1 cold, 1 hot, 3 warm ===
-combos = set()
-for cold in cold_numbers:
-    for hot in hot_numbers:
-        for warms in itertools.combinations(warm_numbers, 3):
-            # Prevent overlap if warm equals hot or cold (shouldn't happen, but defensive)
-            full_combo = set(warms) | {cold, hot}
-            if len(full_combo) == 5:
-                combos.add(tuple(sorted(full_combo)))
-
-print(f"Total raw combos with 1 cold, 1 hot, 3 warm: {len(combos)}")
-
-# === (OPTIONAL) FILTER LOGIC ===
-
-
-from utils.combo_filters import (
-    valid_even_odd, has_3_consecutive, in_past_draws, in_sum_range, must_include
-)
-from utils.lottery_stats import recent_hits, draws_set
+# === STREAM ALL PICK 5 COMBOS: 1 cold, 1 hot, 3 warm -> filter -> CSV ===
+# Combos are generated, filtered and written one chunk at a time, so memory
+# stays bounded however many candidates there are
+from utils.combo_stream import StreamStats, generate_groups, filter_combos, write_csv
+from utils.combinadic import ComboSet
 SUM_RANGE = (80, 140)
-past_draws = draws_set(df, NUMBER_COLUMNS)
-filtered_combos = []
-for combo in combos:
-    if not valid_even_odd(combo): continue
-    if has_3_consecutive(combo): continue
-    if in_past_draws(combo, past_draws): continue
-    if not in_sum_range(combo, SUM_RANGE): continue
-    filtered_combos.append(combo)
-print(f"Combos after filtering: {len(filtered_combos)}")
-combos = filtered_combos
-
-# === EXPORT RESULTS ===
-combo_list = [dict(Num1=combo[0], Num2=combo[1], Num3=combo[2], Num4=combo[3], Num5=combo[4]) for combo in combos]
-combo_df = pd.DataFrame(combo_list)
-combo_df.to_csv(OUTPUT_PATH, index=False)
+past_draws = ComboSet.from_draws(df, NUMBER_COLUMNS)
+stats = StreamStats()
+
+# Rows repeating a number (warm equal to hot or cold) are dropped by the generator
+chunks = generate_groups([(cold_numbers, 1), (hot_numbers, 1), (warm_numbers, 3)], stats=stats)
+chunks = filter_combos(chunks, {
+    "even_required": (2, 3),
+    "no_3_consecutive": True,
+    "past_draws": past_draws,
+    "sum_range": SUM_RANGE,
+}, stats)
+n_saved = write_csv(chunks, OUTPUT_PATH, stats)
+
+print(f"Total raw combos with 1 cold, 1 hot, 3 warm: {stats.out_count('generate')}")
+print(f"Combos after filtering: {n_saved}")
 print(f"Combos saved to {OUTPUT_PATH}")
+print(stats.table().to_string(index=False))
 
 # === (OPTIONAL) PRINT SAMPLE COMBOS ===
 print("Sample combos:")
-for row in combo_df.head(10).itertuples(index=False):
+for row in pd.read_csv(OUTPUT_PATH, nrows=10).itertuples(index=False):
     print(row)
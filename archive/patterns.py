@@ -6,6 +6,9 @@ from scipy.stats import chisquare, stats, norm, linregress
 from statsmodels.sandbox.stats.runs import runstest_1samp
 from itertools import combinations
 import math
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.window_counts import cumulative_counts, rolling_frequency
 
 # Load CSV
 df = pd.read_csv('hit5_clean_deduped.csv')
@@ -110,11 +113,13 @@ window = 30  # rolling window size
 positions = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5']
 number_to_analyze = 12  # Example: change to any number
 
+# One prefix-sum pass gives the rolling count for all five positions at once
+indicator = (df_date[positions].to_numpy() == number_to_analyze)
+rolling_by_position = rolling_frequency(cumulative_counts(indicator), window)
+
 plt.figure(figsize=(14,8))
-for pos in positions:
-    indicator = (df_date[pos] == number_to_analyze).astype(int)
-    rolling_freq = indicator.rolling(window=window, min_periods=1).sum()
-    plt.plot(df['Date'], rolling_freq, label=pos)
+for k, pos in enumerate(positions):
+    plt.plot(df['Date'], rolling_by_position[:, k], label=pos)
 
 plt.xlabel('Draw Date')
 plt.ylabel(f'Rolling {window}-Draw Frequency for {number_to_analyze}')
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Single command-line entry point for the Hit 5 pipeline.
+
+    python hit5.py ingest     # append today's draws (or --convert / --compact)
+    python hit5.py stats      # frequency, hot/warm/cold and gap summary
+    python hit5.py pool       # domain pool from select_pool
+    python hit5.py combos     # filtered, scored combos from the pool
+    python hit5.py wheel      # small ticket set with a match guarantee over the pool
+    python hit5.py backtest   # pool / gap / ml / hybrid backtests
+    python hit5.py plots      # full analysis with charts
+
+Only numpy/pandas are imported up front. matplotlib, seaborn, scikit-learn,
+scipy and statsmodels are imported inside the subcommands that use them.
+Pass --timing to print wall time and which heavy modules got loaded, or run
+`python -X importtime hit5.py stats` for a per-module breakdown.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+_START = time.perf_counter()
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from utils.game import HIT5
+
+GAME = HIT5
+NUMBER_COLUMNS = GAME.number_columns
+HISTORY_PATH = 'data/hit5_all_history.csv'
+RECENT_PATH = 'data/hit5_clean_deduped.csv'
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'sklearn', 'scipy', 'statsmodels', 'bs4', 'requests']
+
+
+def _run_script(name, as_main=True):
+    """Runs (or loads the functions of) a script in scripts/ from the repo root."""
+    import runpy
+    os.chdir(ROOT)
+    return runpy.run_path(os.path.join(ROOT, 'scripts', name), run_name='__main__' if as_main else name)
+
+
+def cmd_ingest(args):
+    if args.convert:
+        from utils.draw_store import convert_csv
+        for path in args.files or [HISTORY_PATH, RECENT_PATH]:
+            print(f"{path} -> {convert_csv(path)}")
+    elif args.compact:
+        from utils.ingest import compact
+        print(f"Compacted {args.history}: {compact(args.history)} draws")
+    else:
+        from utils.fetch import BASE, make_session, fetch_page
+        from utils.http_cache import PageCache
+        from utils.draw_parser import parse_draw_page
+        from utils.ingest import append_draws
+        params = {"gamename": "hit5", "unittype": "day", "unitcount": args.days}
+        rows = parse_draw_page(fetch_page(make_session(), params, base=BASE, cache=PageCache()))
+        print(f"Appended {append_draws(args.history, rows)} new draws to {args.history}")
+
+
+def cmd_stats(args):
+    from utils.draw_store import load_draws
+    from utils.lottery_stats import number_frequency, calculate_gaps, get_hot_warm_cold, longest_gap_per_number
+    df = load_draws(args.data)
+    if args.window:
+        df = df.tail(args.window)
+    freq = number_frequency(df, NUMBER_COLUMNS)
+    hot, warm, cold = get_hot_warm_cold(df, NUMBER_COLUMNS)
+    longest = longest_gap_per_number(calculate_gaps(df, NUMBER_COLUMNS))
+    print(f"Draws: {len(df)} ({df['Date'].min():%Y-%m-%d} to {df['Date'].max():%Y-%m-%d})")
+    print(f"Hot numbers: {hot}")
+    print(f"Warm numbers: {warm}")
+    print(f"Cold numbers: {cold}")
+    top = sorted(freq, key=freq.get, reverse=True)[:10]
+    print("Most frequent: " + ", ".join(f"{n} ({freq[n]})" for n in top))
+    widest = sorted(longest, key=longest.get, reverse=True)[:10]
+    print("Longest gaps: " + ", ".join(f"{n} ({longest[n]})" for n in widest))
+
+
+def cmd_pool(args):
+    from utils.draw_store import load_draws
+    from utils.pool_select import select_pool
+    pool = select_pool(load_draws(args.data), NUMBER_COLUMNS, gap_n_cold=args.gap_n_cold)
+    print(f"Pool ({len(pool)}): {sorted(pool)}")
+
+
+def cmd_combos(args):
+    from utils.draw_store import load_draws
+    from utils.lottery_stats import number_frequency
+    from utils.combinadic import ComboSet
+    from utils.combo_stream import StreamStats, generate, filter_combos, score_combos, top_k
+    from utils.pool_select import select_pool
+    df = load_draws(args.data)
+    pool = select_pool(df, NUMBER_COLUMNS, gap_n_cold=args.gap_n_cold)
+    freq = number_frequency(df, NUMBER_COLUMNS)
+    # Same generate -> filter -> score -> top_k stream as archive/combos.py
+    stats = StreamStats()
+    chunks = filter_combos(generate(pool, GAME.picks, stats=stats), {
+        "even_required": (2, 3),
+        "no_3_consecutive": True,
+        "past_draws": ComboSet.from_draws(df, NUMBER_COLUMNS, GAME.max_number),
+        "sum_range": tuple(args.sum_range),
+    }, stats, GAME)
+    combos, scores = top_k(score_combos(chunks, freq, stats), args.top, stats)
+    print(f"Pool ({len(pool)}): {sorted(pool)}; {stats.out_count('filter')} combos after filtering")
+    for combo, score in zip(combos, scores):
+        print(f"{tuple(int(n) for n in combo)} - Score: {score}")
+
+
+def cmd_wheel(args):
+    from utils.wheel import wheel
+    if args.pool:
+        pool = args.pool
+    else:
+        from utils.draw_store import load_draws
+        from utils.pool_select import select_pool
+        pool = select_pool(load_draws(args.data), NUMBER_COLUMNS, gap_n_cold=args.gap_n_cold)
+    if_match = args.if_match or GAME.picks
+    tickets = wheel(pool, args.guarantee, if_match, GAME, time_limit=args.time_limit)
+    print(f"Pool ({len(pool)}): {sorted(pool)}")
+    print(f"{len(tickets)} tickets guarantee {args.guarantee} matched if {if_match} winners are in the pool "
+          f"(checked against all {math.comb(len(pool), if_match):,} cases)")
+    for ticket in tickets:
+        print(ticket)
+
+
+def cmd_backtest(args):
+    if args.sweep:
+        from utils.draw_store import load_draws
+        from utils.sweep import DEFAULT_GRID, chronological_incidence, sweep
+        results = sweep(chronological_incidence(load_draws(args.data), NUMBER_COLUMNS, GAME.max_number),
+                        DEFAULT_GRID, args.workers)
+        print(results.sort_values(["coverage", "mean_matches"], ascending=False).to_string(index=False))
+    elif args.kind in ('pool', 'gap'):
+        from utils.draw_store import load_draws
+        script = _run_script('backtest_pool.py', as_main=False)
+        df = load_draws(args.data)
+        if args.kind == 'pool':
+            script['backtest_pool_strategy'](df, NUMBER_COLUMNS, test_window=args.test_window)
+        else:
+            script['backtest_gap_pool'](df, NUMBER_COLUMNS, test_window=args.test_window)
+    else:
+        _run_script('backtest.py' if args.kind == 'ml' else 'hybrid_backtest.py')
+
+
+def cmd_plots(args):
+    script = _run_script('analysis.py', as_main=False)
+    script['main'](args.data)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='hit5', description="Hit 5 lottery analysis pipeline.")
+    parser.add_argument('--timing', action='store_true', help="Print run time and heavy modules loaded")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest', help="Append new draws, convert CSVs to binary stores, or compact history")
+    p.add_argument('--history', default=HISTORY_PATH)
+    p.add_argument('--days', type=int, default=1, help="How many recent days to fetch")
+    p.add_argument('--convert', action='store_true', help="Rebuild binary draw stores from CSV")
+    p.add_argument('--compact', action='store_true', help="Sort and deduplicate the history file")
+    p.add_argument('files', nargs='*', help="CSV files for --convert")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser('stats', help="Print frequency, hot/warm/cold and gap summary")
+    p.add_argument('--data', default=HISTORY_PATH)
+    p.add_argument('--window', type=int, help="Only use the last N draws")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser('pool', help="Select the domain number pool")
+    p.add_argument('--data', default=RECENT_PATH)
+    p.add_argument('--gap-n-cold', type=int, default=5)
+    p.set_defaults(func=cmd_pool)
+
+    p = sub.add_parser('combos', help="Generate filtered, scored combos from the pool")
+    p.add_argument('--data', default=RECENT_PATH)
+    p.add_argument('--gap-n-cold', type=int, default=5)
+    p.add_argument('--sum-range', type=int, nargs=2, default=(80, 140))
+    p.add_argument('--top', type=int, default=10)
+    p.set_defaults(func=cmd_combos)
+
+    p = sub.add_parser('wheel', help="Build a covering ticket set (wheel) over the pool")
+    p.add_argument('--data', default=RECENT_PATH)
+    p.add_argument('--gap-n-cold', type=int, default=5)
+    p.add_argument('--pool', type=int, nargs='+', help="Wheel these numbers instead of the selected pool")
+    p.add_argument('--guarantee', type=int, default=3, help="Numbers matched on at least one ticket")
+    p.add_argument('--if-match', type=int, help="...when this many winners are in the pool (default: all)")
+    p.add_argument('--time-limit', type=float, default=5.0, help="Seconds of local search after greedy")
+    p.set_defaults(func=cmd_wheel)
+
+    p = sub.add_parser('backtest', help="Run a backtest")
+    p.add_argument('--kind', choices=['pool', 'gap', 'ml', 'hybrid'], default='pool')
+    p.add_argument('--data', default=RECENT_PATH)
+    p.add_argument('--test-window', type=int, default=100)
+    p.add_argument('--sweep', action='store_true', help="Sweep pool strategy parameters in parallel (utils.sweep)")
+    p.add_argument('--workers', type=int, help="Processes for --sweep (default: all cores)")
+    p.set_defaults(func=cmd_backtest)
+
+    p = sub.add_parser('plots', help="Run the full analysis and save charts to plots/")
+    p.add_argument('--data', default=HISTORY_PATH)
+    p.set_defaults(func=cmd_plots)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    args.func(args)
+    if args.timing:
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+        print(f"[timing] startup {started - _START:.3f}s, command {time.perf_counter() - started:.3f}s, "
+              f"heavy modules loaded: {', '.join(loaded) or 'none'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
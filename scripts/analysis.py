@@ -4,130 +4,153 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 import pandas as pd
 import numpy as np
 import math
-from statsmodels.sandbox.stats.runs import runstest_1samp
-from scipy.stats import linregress, norm
+from utils.draw_store import load_draws
+from utils.game import HIT5
+from utils.prize_odds import odds_table, expected_value
 from utils.lottery_stats import (
     calculate_gaps, number_frequency, get_hot_warm_cold,
     longest_gap_per_number
 )
-from utils.viz import (
-    plot_number_frequency, plot_gap_histogram,
-    plot_hot_warm_cold, plot_sum_trend, plot_empirical_vs_theoretical, plot_residuals_heatmap, plot_gap_length_per_number
-)
 
-# --- Load Data ---
 DATA_PATH = 'data/hit5_all_history.csv'
-NUMBER_COLUMNS = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5']
-df = pd.read_csv(DATA_PATH)
-all_numbers = pd.Series(df[NUMBER_COLUMNS].values.flatten())
+GAME = HIT5
+NUMBER_COLUMNS = GAME.number_columns
 
 # --- General Odds Analysis ---
 def odds_hit5_single_ticket():
-    n_total = 42
-    combo_size = 5
-    total_combos = math.comb(n_total, combo_size)
+    total_combos = GAME.total_combos
     odds = 1 / total_combos
     print(f"Total possible Hit 5 combinations: {total_combos:,}")
-    print(f"Odds of winning with one ticket: 1 in {total_combos:,} ({odds:.8f})\n")
+    print(f"Odds of winning with one ticket: 1 in {total_combos:,} ({odds:.8f})")
+    tiers = odds_table(game=GAME)
+    for row in tiers[tiers["prize"] > 0].itertuples():
+        print(f"  {row.matches} of {GAME.picks}: 1 in {row.odds:,.1f} (prize ${row.prize:,.0f})")
+    print(f"Expected net return per $1 ticket: {expected_value(game=GAME):+.4f}\n")
 
 def odds_hit5_pool(pool_size=21):
-    combo_size = 5
+    combo_size = GAME.picks
     pool_combos = math.comb(pool_size, combo_size)
     odds = 1 / pool_combos
     print(f"Pool size: {pool_size}")
     print(f"Number of 5-number combos from pool: {pool_combos:,}")
     print(f"Odds of jackpot if you play every possible combo from pool: 1 in {pool_combos:,} ({odds:.8f})")
-    print("(Note: Only if the pool contains all 5 drawn numbers)\n")
-
-# Show for pick 5, then domain pool of 21
-odds_hit5_single_ticket()
-odds_hit5_pool(pool_size=21)
-
-# --- Frequency Analysis ---
-freq = number_frequency(df, NUMBER_COLUMNS)
-mean_freq = np.mean(list(freq.values()))
-std_freq = np.std(list(freq.values()))
-hot, warm, cold = get_hot_warm_cold(df, NUMBER_COLUMNS)
-print(f"Hot numbers (more frequent): {hot}")
-print(f"Warm numbers (average frequency): {warm}")
-print(f"Cold numbers (less frequent): {cold}")
-plot_number_frequency(freq, title="Number Frequency in Draws")
-
-# Prepare frequency data and categories
-freq_dict = number_frequency(df, NUMBER_COLUMNS)
-hot, warm, cold = get_hot_warm_cold(df, NUMBER_COLUMNS)
-
-# Make the plot
-plot_hot_warm_cold(freq_dict, hot, warm, cold)
-
-# --- Standardized Residuals ---
-N_NUMBERS = 42  # update this if your lottery has a different range
-EXPECTED = len(df) * 5 / N_NUMBERS  # 5 numbers per draw, N draws
-plot_residuals_heatmap(freq, n_numbers=N_NUMBERS, n_draws=len(df), expected_per_number=EXPECTED, title="Standardized Residuals (Chi-Square Test)")
-
-# --- Summary Statistics ---
-print(f"Total Draws: {len(df)}")
-print(f"Mean number drawn: {all_numbers.mean():.2f}")
-print(f"Median: {all_numbers.median():.2f}")
-print(f"Standard deviation: {all_numbers.std():.2f}")
-print(f"Minimum: {all_numbers.min()}")
-print(f"Maximum: {all_numbers.max()}")
-print(f"Mode(s): {all_numbers.mode().tolist()}")
-
-# --- Consecutive Numbers ---
-count_consec = sum(np.any(np.diff(sorted(row)) == 1) for row in df[NUMBER_COLUMNS].values)
-percent_consec = 100 * count_consec / len(df)
-print(f"Draws with at least one consecutive pair: {count_consec}")
-print(f"Percent with consecutive pair: {percent_consec:.1f}%")
-
-# --- Gap Analysis ---
-gaps = calculate_gaps(df, NUMBER_COLUMNS)
-plot_gap_histogram(gaps)
-longest_gaps = longest_gap_per_number(gaps)
-print(f"Longest gaps per number: {dict(list(longest_gaps.items())[:10])}")
-plot_gap_length_per_number(gaps, title="Gap Lengths by Number")
-
-# --- Empirical vs Theoretical Probability ---
-prob_df = pd.DataFrame({
-    "Number": range(1, 43),
-    "Empirical Probability": pd.Series(freq) / len(df),
-    "Theoretical Probability": [5/42] * 42
-})
-plot_empirical_vs_theoretical(prob_df)
-
-# --- Temporal Pattern Analysis ---
-sum_win = df[NUMBER_COLUMNS].sum(axis=1)
-plot_sum_trend(df, NUMBER_COLUMNS)
-
-# --- Runs Test for Randomness ---
-median = all_numbers.median()
-binary_seq = (all_numbers > median).astype(int)
-z_stat, p_val = runstest_1samp(binary_seq, correction=True)
-print(f"Runs test z-statistic: {z_stat:.2f}, p-value: {p_val:.4f}")
-if p_val < 0.05:
-    print("Reject H0: Sequence shows non-randomness.")
-else:
-    print("Fail to reject H0: Sequence appears random.")
-
-# --- Serial Correlation ---
-for col in NUMBER_COLUMNS:
-    series = df[col].dropna()
-    if hasattr(series, "autocorr"):
-        corr = series.autocorr(lag=1)
-        print(f"Lag-1 serial correlation for {col}: {corr:.3f}")
-
-# --- Longest/Average Gap DataFrames ---
-longest_gap_df = pd.DataFrame(list(longest_gaps.items()), columns=["Number", "Longest Gap"])
-print(longest_gap_df.head())
-gap_avgs = {num: np.mean(g) if g else np.nan for num, g in gaps.items()}
-avg_gap_df = pd.DataFrame(list(gap_avgs.items()), columns=["Number", "Average Gap"])
-print(avg_gap_df.head())
-
-# --- Sums & Trends ---
-x = np.arange(len(sum_win))
-slope, intercept, rvalue, pvalue, stderr = linregress(x, sum_win)
-print(f"Sum trend slope: {slope:.3f}, p-value: {pvalue:.3g}")
-if pvalue < 0.05:
-    print(f"Significant trend detected: {'Upward' if slope > 0 else 'Downward'}")
-else:
-    print("No significant trend detected.")
+    print("(Note: Only if the pool contains all 5 drawn numbers)")
+    print("For a far smaller ticket set that still guarantees a 3-number match, see: python hit5.py wheel\n")
+
+def main(data_path=DATA_PATH):
+    # Plotting and test libraries are slow to import; only load them when the pipeline runs
+    from statsmodels.sandbox.stats.runs import runstest_1samp
+    from scipy.stats import linregress
+    from utils.incidence import incidence_matrix
+    from utils.randomness import randomness_tests
+    from utils.viz import (
+        set_style, plot_number_frequency, plot_gap_histogram,
+        plot_hot_warm_cold, plot_sum_trend, plot_empirical_vs_theoretical, plot_residuals_heatmap, plot_gap_length_per_number
+    )
+    set_style()
+
+    # --- Load Data ---
+    df = load_draws(data_path)
+    all_numbers = pd.Series(df[NUMBER_COLUMNS].values.flatten())
+
+    # Show for pick 5, then domain pool of 21
+    odds_hit5_single_ticket()
+    odds_hit5_pool(pool_size=21)
+
+    # --- Frequency Analysis ---
+    freq = number_frequency(df, NUMBER_COLUMNS)
+    hot, warm, cold = get_hot_warm_cold(df, NUMBER_COLUMNS)
+    print(f"Hot numbers (more frequent): {hot}")
+    print(f"Warm numbers (average frequency): {warm}")
+    print(f"Cold numbers (less frequent): {cold}")
+    plot_number_frequency(freq, title="Number Frequency in Draws")
+
+    # Prepare frequency data and categories
+    freq_dict = number_frequency(df, NUMBER_COLUMNS)
+    hot, warm, cold = get_hot_warm_cold(df, NUMBER_COLUMNS)
+
+    # Make the plot
+    plot_hot_warm_cold(freq_dict, hot, warm, cold)
+
+    # --- Standardized Residuals ---
+    N_NUMBERS = GAME.max_number
+    EXPECTED = len(df) * GAME.picks / N_NUMBERS  # picks numbers per draw, N draws
+    plot_residuals_heatmap(freq, n_numbers=N_NUMBERS, n_draws=len(df), expected_per_number=EXPECTED, title="Standardized Residuals (Chi-Square Test)")
+
+    # --- Summary Statistics ---
+    print(f"Total Draws: {len(df)}")
+    print(f"Mean number drawn: {all_numbers.mean():.2f}")
+    print(f"Median: {all_numbers.median():.2f}")
+    print(f"Standard deviation: {all_numbers.std():.2f}")
+    print(f"Minimum: {all_numbers.min()}")
+    print(f"Maximum: {all_numbers.max()}")
+    print(f"Mode(s): {all_numbers.mode().tolist()}")
+
+    # --- Consecutive Numbers ---
+    count_consec = sum(np.any(np.diff(sorted(row)) == 1) for row in df[NUMBER_COLUMNS].values)
+    percent_consec = 100 * count_consec / len(df)
+    print(f"Draws with at least one consecutive pair: {count_consec}")
+    print(f"Percent with consecutive pair: {percent_consec:.1f}%")
+
+    # --- Gap Analysis ---
+    gaps = calculate_gaps(df, NUMBER_COLUMNS)
+    plot_gap_histogram(gaps)
+    longest_gaps = longest_gap_per_number(gaps)
+    print(f"Longest gaps per number: {dict(list(longest_gaps.items())[:10])}")
+    plot_gap_length_per_number(gaps, title="Gap Lengths by Number")
+
+    # --- Empirical vs Theoretical Probability ---
+    prob_df = pd.DataFrame({
+        "Number": GAME.numbers,
+        "Empirical Probability": pd.Series(freq) / len(df),
+        "Theoretical Probability": [GAME.hit_probability] * GAME.max_number
+    })
+    plot_empirical_vs_theoretical(prob_df)
+
+    # --- Temporal Pattern Analysis ---
+    sum_win = df[NUMBER_COLUMNS].sum(axis=1)
+    plot_sum_trend(df, NUMBER_COLUMNS)
+
+    # --- Runs Test for Randomness ---
+    median = all_numbers.median()
+    binary_seq = (all_numbers > median).astype(int)
+    z_stat, p_val = runstest_1samp(binary_seq, correction=True)
+    print(f"Runs test z-statistic: {z_stat:.2f}, p-value: {p_val:.4f}")
+    if p_val < 0.05:
+        print("Reject H0: Sequence shows non-randomness.")
+    else:
+        print("Fail to reject H0: Sequence appears random.")
+
+    # --- Serial Correlation ---
+    for col in NUMBER_COLUMNS:
+        series = df[col].dropna()
+        if hasattr(series, "autocorr"):
+            corr = series.autocorr(lag=1)
+            print(f"Lag-1 serial correlation for {col}: {corr:.3f}")
+
+    # --- Batched Randomness Tests (all numbers, positions and lags, FDR-corrected) ---
+    tests = randomness_tests(incidence_matrix(df, NUMBER_COLUMNS), df[NUMBER_COLUMNS], max_lag=20)
+    flagged = tests[tests["significant"]]
+    print(f"Randomness tests run: {len(tests)}, significant after BH correction: {len(flagged)}")
+    print(flagged.groupby("test").size().to_string())
+    print(tests.nsmallest(10, "p_adjusted").to_string(index=False))
+
+    # --- Longest/Average Gap DataFrames ---
+    longest_gap_df = pd.DataFrame(list(longest_gaps.items()), columns=["Number", "Longest Gap"])
+    print(longest_gap_df.head())
+    gap_avgs = {num: np.mean(g) if g else np.nan for num, g in gaps.items()}
+    avg_gap_df = pd.DataFrame(list(gap_avgs.items()), columns=["Number", "Average Gap"])
+    print(avg_gap_df.head())
+
+    # --- Sums & Trends ---
+    x = np.arange(len(sum_win))
+    slope, intercept, rvalue, pvalue, stderr = linregress(x, sum_win)
+    print(f"Sum trend slope: {slope:.3f}, p-value: {pvalue:.3g}")
+    if pvalue < 0.05:
+        print(f"Significant trend detected: {'Upward' if slope > 0 else 'Downward'}")
+    else:
+        print("No significant trend detected.")
+
+
+if __name__ == "__main__":
+    main()
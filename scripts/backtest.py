@@ -1,59 +1,33 @@
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-import pandas as pd
-import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_curve, auc
 import matplotlib.pyplot as plt
+from utils.draw_store import load_draws
+from utils.incidence import incidence_matrix
+from utils.walk_features import feature_matrix
+from utils.game import HIT5
 
 # --- Config ---
 DATA_PATH = 'data/hit5_clean_deduped.csv'
-NUMBER_COLUMNS = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5']
-all_possible_numbers = list(range(1, 43))
-
-# --- Feature creation for a single number ---
-def make_features(train_df, number):
-    freq = train_df[NUMBER_COLUMNS].apply(lambda row: number in row.values, axis=1).sum()
-    last_hit = train_df[NUMBER_COLUMNS].apply(lambda row: number in row.values, axis=1)[::-1]
-    last_idx = np.where(last_hit.values)[0]
-    gap = len(train_df) - last_idx[0] if len(last_idx) else len(train_df)
-    window_freq = train_df[NUMBER_COLUMNS].tail(20).apply(lambda row: number in row.values, axis=1).sum()
-    # Mean gap stat
-    indices = train_df[NUMBER_COLUMNS].apply(lambda row: number in row.values, axis=1)
-    hit_indices = np.where(indices.values)[0]
-    gaps = [hit_indices[0]] + [hit_indices[j] - hit_indices[j-1] for j in range(1, len(hit_indices))] if len(hit_indices) else []
-    mean_gap = np.mean(gaps) if gaps else len(train_df)
-    avg_gap, std_gap = 8.26, 1.76
-    category = 'warm'
-    if mean_gap < (avg_gap - std_gap): category = 'hot'
-    elif mean_gap > (avg_gap + std_gap): category = 'cold'
-    category_code = {'hot':2, 'warm':1, 'cold':0}[category]
-    return [freq, gap, window_freq, category_code]
+GAME = HIT5
+NUMBER_COLUMNS = GAME.number_columns
+all_possible_numbers = list(GAME.numbers)
 
 # --- Load data ---
-df = pd.read_csv(DATA_PATH)
+df = load_draws(DATA_PATH)
 train_idx = int(len(df) * 0.8)
+X = incidence_matrix(df, NUMBER_COLUMNS, GAME.max_number)
 
 # --- Build training data ---
-train_features, train_labels = [], []
-for i in range(10, train_idx):
-    prev_window = df[NUMBER_COLUMNS].iloc[:i]
-    next_draw = set(df.loc[i, NUMBER_COLUMNS])
-    for n in all_possible_numbers:
-        train_features.append(make_features(prev_window, n))
-        train_labels.append(int(n in next_draw))
+# Features of every number before draw i (one walk over the history); label: drawn in draw i
+train_features = feature_matrix(X, range(10, train_idx))
+train_labels = X[10:train_idx].ravel().astype(int)
 
 # --- Build test data ---
-test_features, test_labels = [], []
-for i in range(train_idx, len(df)-1):
-    prev_window = df[NUMBER_COLUMNS].iloc[:i]
-    next_draw = set(df.loc[i+1, NUMBER_COLUMNS])
-    for n in all_possible_numbers:
-        test_features.append(make_features(prev_window, n))
-        test_labels.append(int(n in next_draw))
-
-train_features = np.array(train_features)
-test_features = np.array(test_features)
+# Features before draw i; label: drawn in draw i+1
+test_features = feature_matrix(X, range(train_idx, len(df)-1))
+test_labels = X[train_idx+1:len(df)].ravel().astype(int)
 
 # --- Fit balanced classifier ---
 clf = RandomForestClassifier(
@@ -1,36 +1,47 @@
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pandas as pd
-from utils.pool_select import select_pool, select_gap_pool
+from utils.pool_select import select_pool_from_state, select_gap_pool_from_state
+from utils.online_stats import DrawStatsState
+from utils.draw_store import load_draws
+from utils.game import HIT5
+from utils.draw_index import frame_index
 
 # --- Config ---
 DATA_PATH = 'data/hit5_clean_deduped.csv'
-NUMBER_COLUMNS = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5']
+NUMBER_COLUMNS = HIT5.number_columns
 GAP_N_COLD = 5   # Number of excessively cold numbers to include in each pool
 TEST_WINDOW = 100   # How many of the last draws to test over
 N_HOT = 1
 N_WARM = 3
 N_COLD = 1
 
+def last_draws(df, test_window, as_of=None):
+    """Returns the last test_window draws (on or before as_of) in date order, re-indexed from 0."""
+    index = frame_index(df)
+    return df.iloc[index.last(test_window, as_of)].reset_index(drop=True)
+
 def backtest_pool_strategy(df, number_columns, test_window=TEST_WINDOW, gap_n_cold=GAP_N_COLD):
-    backtest_df = df.tail(test_window).reset_index(drop=True)
+    backtest_df = last_draws(df, test_window)
+    draws = backtest_df[number_columns].to_numpy()
+    # Walk forward: the state holds draws [0, idx) when draw idx is tested
+    state = DrawStatsState()
     results = []
     for idx in range(test_window):
-        train_df = backtest_df.iloc[:idx]
-        current_draw = backtest_df.iloc[idx]
-        if len(train_df) < 20:
-            continue
-        # Use the shared pool selection logic!
-        pool = select_pool(train_df, number_columns, gap_n_cold)
-        draw_nums = set(current_draw[number_columns])
-        matches = draw_nums.intersection(pool)
-        results.append({
-            "draw": idx,
-            "draw_nums": draw_nums,
-            "pool": pool,
-            "match_count": len(matches),
-            "all_in_pool": draw_nums.issubset(pool)
-        })
+        current_draw = draws[idx]
+        if idx >= 20:
+            # Use the shared pool selection logic!
+            pool = select_pool_from_state(state, gap_n_cold)
+            draw_nums = set(current_draw)
+            matches = draw_nums.intersection(pool)
+            results.append({
+                "draw": idx,
+                "draw_nums": draw_nums,
+                "pool": pool,
+                "match_count": len(matches),
+                "all_in_pool": draw_nums.issubset(pool)
+            })
+        state.push(current_draw)
     results_df = pd.DataFrame(results)
     # Report
     coverage = results_df["all_in_pool"].mean()
@@ -42,23 +53,24 @@ def backtest_pool_strategy(df, number_columns, test_window=TEST_WINDOW, gap_n_co
     return results_df
 
 def backtest_gap_pool(df, number_columns, test_window=TEST_WINDOW):
-    backtest_df = df.tail(test_window).reset_index(drop=True)
+    backtest_df = last_draws(df, test_window)
+    draws = backtest_df[number_columns].to_numpy()
+    state = DrawStatsState()
     results = []
     for idx in range(test_window):
-        train_df = backtest_df.iloc[:idx]
-        current_draw = backtest_df.iloc[idx]
-        if len(train_df) < 20:
-            continue
-        pool = select_gap_pool(train_df, number_columns, N_HOT, N_WARM, N_COLD)
-        draw_nums = set(current_draw[number_columns])
-        matches = draw_nums.intersection(pool)
-        results.append({
-            "draw": idx,
-            "draw_nums": draw_nums,
-            "pool": pool,
-            "match_count": len(matches),
-            "all_in_pool": draw_nums.issubset(pool)
-        })
+        current_draw = draws[idx]
+        if idx >= 20:
+            pool = select_gap_pool_from_state(state, N_HOT, N_WARM, N_COLD)
+            draw_nums = set(current_draw)
+            matches = draw_nums.intersection(pool)
+            results.append({
+                "draw": idx,
+                "draw_nums": draw_nums,
+                "pool": pool,
+                "match_count": len(matches),
+                "all_in_pool": draw_nums.issubset(pool)
+            })
+        state.push(current_draw)
     results_df = pd.DataFrame(results)
     # Report
     coverage = results_df["all_in_pool"].mean()
@@ -70,7 +82,7 @@ def backtest_gap_pool(df, number_columns, test_window=TEST_WINDOW):
     return results_df
 
 if __name__ == "__main__":
-    df = pd.read_csv(DATA_PATH)
+    df = load_draws(DATA_PATH)
     backtest_pool_strategy(df, NUMBER_COLUMNS)
     print("=== Basic Pool Backtest ===")
     results_basic = backtest_pool_strategy(df, NUMBER_COLUMNS)
@@ -0,0 +1,69 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import time
+import tracemalloc
+import pandas as pd
+from utils.game import HIT5, LOTTO_6_49, POWERBALL, GameSpec
+from utils import combinadic, combo_filters
+from utils.combinadic import ComboSet, all_combos
+from utils.combo_filters import apply_filters
+
+# How the combo engine scales with the game: time and memory to build every
+# ticket, hold a ComboSet over them and run a filter chain across the whole space.
+
+GAMES = [HIT5, GameSpec(49, 5, name="5-of-49"), POWERBALL, LOTTO_6_49]
+
+
+def measure(fn):
+    """Returns (result, seconds, peak bytes allocated while fn ran)."""
+    tracemalloc.start()
+    t = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - t
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def bench_game(game):
+    spec = {"even_required": tuple(range(game.picks // 2 - 1, game.picks // 2 + 2)), "no_3_consecutive": True}
+    combos, t_build, peak_build = measure(lambda: all_combos(game.picks, game.max_number))
+    n = len(combos)
+    combo_set, t_set, _ = measure(lambda: ComboSet.from_mask(apply_filters(spec, combos, game), game.picks, game.max_number))
+    # The same chain over every ticket (combos=None), as apply_filters is usually called
+    _, t_filter, peak_filter = measure(lambda: apply_filters(spec, None, game))
+    row = {
+        "game": game.label(),
+        "combos": n,
+        "build_s": t_build,
+        "combos_MB": combos.nbytes / 1e6,
+        "build_peak_MB": peak_build / 1e6,
+        "comboset_s": t_set,
+        "comboset_KB": combo_set.bits.nbytes / 1e3,
+        "kept": len(combo_set),
+        "filter_s": t_filter,
+        "filter_peak_MB": peak_filter / 1e6,
+        "build_ns_per_combo": t_build / n * 1e9,
+        "filter_ns_per_combo": t_filter / n * 1e9,
+        "bytes_per_combo": (combos.nbytes + combo_set.bits.nbytes) / n,
+    }
+    # Drop the cached universe before the next (larger) game
+    combinadic._universe.cache_clear()
+    combo_filters._universe_masks.cache_clear()
+    return row
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark combo-engine scaling across game sizes.")
+    parser.add_argument("--skip-large", action="store_true", help="skip games with more than 5M combos")
+    args = parser.parse_args()
+
+    rows = []
+    for game in GAMES:
+        if args.skip_large and game.total_combos > 5_000_000:
+            continue
+        print(f"{game.label()}: {game.total_combos:,} combos ...", flush=True)
+        rows.append(bench_game(game))
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:.3f}".format):
+        print(pd.DataFrame(rows).set_index("game").T)
@@ -0,0 +1,43 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import timeit
+from bs4 import BeautifulSoup
+from utils.draw_parser import parse_draw_page
+
+# Benchmark the streaming draw-page parser against the BeautifulSoup tree walk
+# the scrapers used before, and check both produce identical rows.
+
+def parse_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    results = []
+    for date_tag in soup.find_all('p', class_='h2-like'):
+        draw_date = date_tag.get_text(strip=True)
+        tbl = date_tag.find_parent('th').find_parent('tr').find_parent('thead').find_parent('table')
+        for balls_td in tbl.find_all('td', class_='game-balls'):
+            nums = [li.get_text(strip=True) for li in balls_td.find_all('li')]
+            nums = [n for n in nums if n.isdigit() and 1 <= int(n) <= 42]
+            if len(nums) == 5:
+                row = [draw_date] + nums
+                if row not in results:
+                    results.append(row)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark draw-page parsers.")
+    parser.add_argument("html_file", nargs="?", default="data/Past_180.html")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.html_file, encoding="utf-8") as f:
+        html = f.read()
+
+    old_rows = parse_bs4(html)
+    new_rows = parse_draw_page(html)
+    assert new_rows == old_rows, "parsers disagree"
+    print(f"{len(new_rows)} rows, identical output")
+
+    t_old = min(timeit.repeat(lambda: parse_bs4(html), number=1, repeat=args.repeat))
+    t_new = min(timeit.repeat(lambda: parse_draw_page(html), number=1, repeat=args.repeat))
+    print(f"BeautifulSoup tree walk: {t_old * 1000:.2f} ms")
+    print(f"parse_draw_page:         {t_new * 1000:.2f} ms ({t_old / t_new:.1f}x faster)")
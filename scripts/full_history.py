@@ -1,39 +1,32 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
 import pandas as pd
-from bs4 import BeautifulSoup
-import requests
 from datetime import date
+from utils.fetch import BASE, fetch_years
+from utils.http_cache import PageCache, CACHE_DIR
+from utils.draw_parser import parse_draw_page
 
-BASE = "https://www.walottery.com/WinningNumbers/PastDrawings.aspx"
+DATE_FORMAT = "%a, %b %d, %Y"
 
-def fetch_year(year: int):
-    params = {
-        "gamename": "hit5",
-        "unittype": "year",
-        "unitcount": year,
-    }
-    r = requests.get(BASE, params=params)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the full Hit 5 history from WA Lottery yearly pages.")
+    parser.add_argument("--base-url", default=BASE, help="PastDrawings.aspx URL (point at a local server to run offline)")
+    parser.add_argument("--start-year", type=int, default=2007)
+    parser.add_argument("--end-year", type=int, default=date.today().year)
+    parser.add_argument("--workers", type=int, default=6, help="Maximum requests in flight")
+    parser.add_argument("--output", default="data/hit5_all_history.csv")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Always download every year")
+    args = parser.parse_args()
 
-    results = []
-    for date_tag in soup.find_all('p', class_='h2-like'):
-        draw_date = date_tag.get_text(strip=True)
-        tbl = date_tag.find_parent('th').find_parent('tr').find_parent('thead').find_parent('table')
-        for balls_td in tbl.find_all('td', class_='game-balls'):
-            nums = [li.get_text(strip=True) for li in balls_td.find_all('li')]
-            nums = [n for n in nums if n.isdigit() and 1 <= int(n) <= 42]
-            if len(nums) == 5:
-                row = [draw_date] + nums
-                if row not in results:
-                    results.append(row)
-    return results
+    cache = None if args.no_cache else PageCache(args.cache_dir)
+    all_results = fetch_years(range(args.start_year, args.end_year + 1), parse_draw_page,
+                              base=args.base_url, max_workers=args.workers, cache=cache)
+    if cache is not None:
+        print(f"Page cache: {cache.stats}")
 
-all_results = []
-for year in range(2007, date.today().year + 1):
-    year_rows = fetch_year(year)
-    all_results.extend(year_rows)
-
-df = pd.DataFrame(all_results, columns=["Date", "Num1", "Num2", "Num3", "Num4", "Num5"])
-df = df.drop_duplicates().sort_values("Date")
-df.to_csv("data/hit5_all_history.csv", index=False)
-print(f"Total draws scraped: {len(df)}")
+    df = pd.DataFrame(all_results, columns=["Date", "Num1", "Num2", "Num3", "Num4", "Num5"])
+    df = df.drop_duplicates().sort_values("Date", key=lambda d: pd.to_datetime(d, format=DATE_FORMAT), kind="stable")
+    df.to_csv(args.output, index=False)
+    print(f"Total draws scraped: {len(df)}")
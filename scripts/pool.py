@@ -1,11 +1,22 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pandas as pd
 import numpy as np
-from itertools import combinations
+from itertools import combinations, compress
+from utils.draw_store import load_draws
+from utils.game import HIT5
+from utils.incidence import incidence_matrix
+from utils.window_counts import cumulative_counts, window_frequency
+from utils.combinadic import ComboSet
+from utils.combo_filters import apply_filters, passes_filters
+from utils.topk import top_k_combos
+from utils.combo_store import write_combo_list
 
 # Load draw data
-df = pd.read_csv('data/hit5_clean_deduped.csv')
-number_columns = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5']
-all_possible_numbers = range(1, 43)
+df = load_draws('data/hit5_clean_deduped.csv')
+GAME = HIT5
+number_columns = GAME.number_columns
+all_possible_numbers = GAME.numbers
 
 # --- Hot/Warm/Cold Gaps calculation ---
 gap_list = {}
@@ -44,12 +55,13 @@ for num in all_possible_numbers:
         gaps[num] = len(df)
 gap_since_last_hit = pd.Series(gaps)
 
+# Prefix sums give the hit count of every number over any window in one subtraction
+hit_counts = cumulative_counts(incidence_matrix(df, number_columns))
 rolling_window = 30
-rolling_freq = {}
-for num in all_possible_numbers:
-    recent_hits = df[number_columns].tail(rolling_window).apply(lambda row: num in row.values, axis=1)
-    rolling_freq[num] = recent_hits.sum()
-rolling_freq = pd.Series(rolling_freq)
+rolling_freq = pd.Series(
+    window_frequency(hit_counts, max(0, len(df) - rolling_window), len(df)),
+    index=all_possible_numbers,
+)
 
 frequency_norm = (frequency - frequency.min()) / (frequency.max() - frequency.min())
 gap_norm = (gap_since_last_hit - gap_since_last_hit.min()) / (gap_since_last_hit.max() - gap_since_last_hit.min())
@@ -60,27 +72,9 @@ score = (1 - frequency_norm) + gap_norm + (1 - rolling_norm)
 # --- Filtering and Combo Generation ---
 recent_hits = set(df[number_columns].tail(2).values.flatten())
 
-def valid_recent(combo):
-    return all(n not in recent_hits for n in combo)
-
-def valid_even_odd(combo):
-    evens = sum(n % 2 == 0 for n in combo)
-    odds = len(combo) - evens
-    return (evens == 2 and odds == 3) or (evens == 3 and odds == 2)
-
-def has_3_consecutive(combo):
-    sorted_combo = sorted(combo)
-    for i in range(len(sorted_combo)-2):
-        if sorted_combo[i]+1 == sorted_combo[i+1] and sorted_combo[i]+2 == sorted_combo[i+2]:
-            return True
-    return False
-
 must_include = set() # e.g. {3, 27}
-def includes_must_have(combo):
-    if not must_include: return True
-    return all(n in combo for n in must_include)
 
-draws_set = set(tuple(sorted(row)) for row in df[number_columns].values)
+past_draws = ComboSet.from_draws(df, number_columns)
 winning_sums = df[number_columns].sum(axis=1)
 sum_mean = winning_sums.mean()
 sum_std = winning_sums.std()
@@ -103,19 +97,29 @@ for warm_group in warm_combos:
             final_combos.append(combo)
 
 # --- Filter and Score Combos ---
+# The whole filter chain runs as array operations over every candidate at once
+filter_spec = {
+    "recent_hits": recent_hits,
+    "must_include": must_include,
+    "sum_range": (sum_min, sum_max),
+    "even_required": (2, 3),
+    "no_3_consecutive": True,
+    "past_draws": past_draws,
+}
+keep = apply_filters(filter_spec, np.array(final_combos, dtype=np.uint8).reshape(-1, GAME.picks))
 filtered_scored_combos = []
-for combo in final_combos:
-    if not valid_recent(combo): continue
-    if not includes_must_have(combo): continue
-    if not (sum_min <= sum(combo) <= sum_max): continue
-    if not valid_even_odd(combo): continue
-    if has_3_consecutive(combo): continue
-    if tuple(sorted(combo)) in draws_set: continue
+for combo in compress(final_combos, keep):
     combo_score = sum(score.get(n, 0) for n in combo)
     filtered_scored_combos.append((combo, combo_score))
 
 # --- Sort and output
-top_100 = sorted(filtered_scored_combos, key=lambda x: x[1], reverse=True)[:100]
+# Scores are additive per number, so a best-first search over the hot/warm/cold
+# groups finds the top 100 without scoring or sorting the whole candidate list
+top_100 = top_k_combos(
+    score, 100,
+    groups=[(warm, N_warm), (hot, N_hot), (cold, N_cold)],
+    predicate=lambda combo: passes_filters(combo, filter_spec),
+)
 print(f'Number of balanced, filtered combos: {len(top_100)}')
 for combo, combo_score in top_100[:5]:
     print(combo, combo_score)
@@ -126,3 +130,12 @@ sorted_combos = sorted(filtered_scored_combos, key=lambda x: x[1], reverse=True)
 with open('data/all_filtered_combos.txt', 'w') as f:
     for combo, combo_score in sorted_combos:
         f.write(f"{combo},{combo_score}\n")
+
+# Same list in the binary combo format (sorted ranks + float32 scores) for fast reloads
+write_combo_list(
+    'data/all_filtered_combos.cmb',
+    [combo for combo, _ in sorted_combos],
+    scores=[combo_score for _, combo_score in sorted_combos],
+    params={"script": "pool.py", "hot": N_hot, "warm": N_warm, "cold": N_cold,
+            "sum_range": [sum_min, sum_max], "rolling_window": rolling_window},
+)
@@ -1,10 +1,12 @@
-import pandas as pd
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.draw_store import load_draws
+from utils.combo_features import load_feature_table, features_for
 
-# 1) Load
-df = pd.read_csv("data/hit5_all_history.csv")
+# 1) Load (Date comes back already parsed from the binary draw store)
+df = load_draws("data/hit5_all_history.csv")
 
-# 2) Parse date, create draw_id
-df["Date"] = pd.to_datetime(df["Date"], format="%a, %b %d, %Y")
+# 2) Sort by date, create draw_id
 df = df.sort_values("Date")
 df["draw_id"] = range(1, len(df) + 1)
 
@@ -18,14 +20,14 @@ df = df.rename(columns={
     "Num5": "ball5",
 })
 
-# 4) Row‑level features
-df["ball_min"] = df[["ball1", "ball2", "ball3", "ball4", "ball5"]].min(axis=1)
-df["ball_max"] = df[["ball1", "ball2", "ball3", "ball4", "ball5"]].max(axis=1)
-df["ball_sum"] = df[["ball1", "ball2", "ball3", "ball4", "ball5"]].sum(axis=1)
-
+# 4) Row‑level features, gathered by combinadic rank from the precomputed feature table
 balls = ["ball1", "ball2", "ball3", "ball4", "ball5"]
-df["odd_count"] = df[balls].apply(lambda r: sum(v % 2 == 1 for v in r), axis=1)
-df["low_count"] = df[balls].apply(lambda r: sum(v <= 21 for v in r), axis=1)
+features = features_for(load_feature_table(), df[balls].to_numpy(), ["min", "max", "sum", "odds", "lows"])
+df["ball_min"] = features["min"].to_numpy()
+df["ball_max"] = features["max"].to_numpy()
+df["ball_sum"] = features["sum"].to_numpy()
+df["odd_count"] = features["odds"].to_numpy()
+df["low_count"] = features["lows"].to_numpy()
 
 # 5) Save wide table for Tableau
 df.to_csv("data/hit5_draws_wide.csv", index=False)
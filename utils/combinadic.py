@@ -0,0 +1,170 @@
+# utils/combinadic.py
+import math
+from functools import lru_cache
+import numpy as np
+from utils.game import HIT5
+
+MAX_NUMBER = HIT5.max_number
+PICKS = HIT5.picks
+TOTAL = HIT5.total_combos  # 850,668
+
+
+@lru_cache(maxsize=None)
+def _binom_table(max_number, picks):
+    """binom[n, k] = C(n, k) for n in 0..max_number, k in 0..picks."""
+    table = np.array([[math.comb(n, k) for k in range(picks + 1)] for n in range(max_number + 1)], dtype=np.int64)
+    table.setflags(write=False)
+    return table
+
+
+def rank(combos, max_number=MAX_NUMBER):
+    """
+    Colex rank of each combo: the sorted 0-based numbers a_0 < ... < a_{k-1}
+    map to sum C(a_i, i+1), a unique index in [0, C(max_number, k)).
+    combos is one combo (any order) or an (M, k) array; returns an int or a
+    uint32 array. Raises ValueError for numbers outside 1..max_number or repeats.
+    """
+    arr = np.asarray(combos, dtype=np.int64)
+    single = arr.ndim == 1
+    arr = np.sort(arr.reshape(-1, arr.shape[-1]), axis=1) - 1
+    picks = arr.shape[1]
+    if arr.size and (arr.min() < 0 or arr.max() >= max_number or (np.diff(arr, axis=1) == 0).any()):
+        raise ValueError(f"combos must hold {picks} distinct numbers in 1..{max_number}")
+    binom = _binom_table(max_number, picks)
+    r = binom[arr, np.arange(1, picks + 1)].sum(axis=1)
+    return int(r[0]) if single else r.astype(np.uint32)
+
+
+def unrank(ranks, picks=PICKS, max_number=MAX_NUMBER):
+    """
+    Inverse of rank: returns the (M, picks) uint8 array of sorted 1-based
+    combos for an array of ranks (or one tuple for a scalar rank).
+    """
+    r = np.array(ranks, dtype=np.int64, ndmin=1)
+    if r.size and (r.min() < 0 or r.max() >= math.comb(max_number, picks)):
+        raise ValueError("rank out of range")
+    binom = _binom_table(max_number, picks)
+    out = np.empty((len(r), picks), dtype=np.uint8)
+    for i in range(picks, 0, -1):
+        # Largest a with C(a, i) <= r
+        a = np.searchsorted(binom[:, i], r, side='right') - 1
+        r = r - binom[a, i]
+        out[:, i - 1] = a + 1
+    return tuple(int(n) for n in out[0]) if np.ndim(ranks) == 0 else out
+
+
+@lru_cache(maxsize=None)
+def _universe(picks, max_number):
+    combos = unrank(np.arange(math.comb(max_number, picks)), picks, max_number)
+    combos.setflags(write=False)
+    return combos
+
+
+def all_combos(picks=PICKS, max_number=MAX_NUMBER):
+    """Every combo in rank order, as a read-only (C(max_number, picks), picks) uint8 array."""
+    return _universe(picks, max_number)
+
+
+class ComboSet:
+    """
+    A set of combos stored as one bit per rank (~106 KB for every 5-of-42
+    ticket). Membership, union, intersection and difference are bitwise ops.
+    """
+
+    def __init__(self, bits=None, picks=PICKS, max_number=MAX_NUMBER):
+        self.picks = picks
+        self.max_number = max_number
+        self.size = math.comb(max_number, picks)
+        n_bytes = (self.size + 7) // 8
+        self.bits = np.zeros(n_bytes, dtype=np.uint8) if bits is None else np.asarray(bits, dtype=np.uint8)
+        if len(self.bits) != n_bytes:
+            raise ValueError(f"expected {n_bytes} bytes of bits")
+        # Python copy of the binomial table for the scalar `in` check
+        self._binom = _binom_table(max_number, picks).tolist()
+
+    @classmethod
+    def for_game(cls, game):
+        """An empty set sized for a utils.game.GameSpec."""
+        return cls(picks=game.picks, max_number=game.max_number)
+
+    @classmethod
+    def from_ranks(cls, ranks, picks=PICKS, max_number=MAX_NUMBER):
+        s = cls(picks=picks, max_number=max_number)
+        s.add_ranks(ranks)
+        return s
+
+    @classmethod
+    def from_combos(cls, combos, max_number=MAX_NUMBER):
+        """Builds a set from an (M, k) array (or list of tuples) of combos."""
+        combos = np.asarray(combos)
+        return cls.from_ranks(rank(combos.reshape(-1, combos.shape[-1]), max_number), combos.shape[-1], max_number)
+
+    @classmethod
+    def from_draws(cls, df, number_columns, max_number=MAX_NUMBER):
+        """The set of past draws: a bitset replacement for lottery_stats.draws_set."""
+        return cls.from_combos(df[number_columns].to_numpy(dtype=np.int64), max_number)
+
+    @classmethod
+    def from_mask(cls, mask, picks=PICKS, max_number=MAX_NUMBER):
+        """Builds a set from a boolean mask over the universe (all_combos order)."""
+        return cls(np.packbits(np.asarray(mask, dtype=bool), bitorder='little'), picks, max_number)
+
+    def _like(self, bits):
+        return ComboSet(bits, self.picks, self.max_number)
+
+    def add_ranks(self, ranks):
+        r = np.asarray(ranks, dtype=np.int64).ravel()
+        np.bitwise_or.at(self.bits, r >> 3, (1 << (r & 7)).astype(np.uint8))
+
+    def add(self, combos):
+        self.add_ranks(rank(np.asarray(combos).reshape(-1, self.picks), self.max_number))
+
+    def contains_ranks(self, ranks):
+        r = np.asarray(ranks, dtype=np.int64)
+        return ((self.bits[r >> 3] >> (r & 7)) & 1).astype(bool)
+
+    def contains(self, combos):
+        """Vectorized membership: boolean array, one entry per combo row."""
+        return self.contains_ranks(rank(np.asarray(combos).reshape(-1, self.picks), self.max_number))
+
+    def __contains__(self, combo):
+        # Pure-Python rank: faster than NumPy for a single tuple
+        nums = sorted(combo)
+        if len(nums) != self.picks or nums[0] < 1 or nums[-1] > self.max_number:
+            return False
+        r = sum(self._binom[n - 1][i] for i, n in enumerate(nums, start=1))
+        return bool((self.bits[r >> 3] >> (r & 7)) & 1)
+
+    def to_mask(self):
+        """Boolean mask over the universe (all_combos order)."""
+        return np.unpackbits(self.bits, count=self.size, bitorder='little').astype(bool)
+
+    def ranks(self):
+        return np.flatnonzero(self.to_mask()).astype(np.uint32)
+
+    def combos(self):
+        return unrank(self.ranks(), self.picks, self.max_number)
+
+    def __len__(self):
+        return int(np.bitwise_count(self.bits).sum())
+
+    def __and__(self, other):
+        return self._like(self.bits & other.bits)
+
+    def __or__(self, other):
+        return self._like(self.bits | other.bits)
+
+    def __sub__(self, other):
+        return self._like(self.bits & ~other.bits)
+
+    def __invert__(self):
+        bits = ~self.bits
+        # Clear the padding bits past the last rank
+        bits[-1] &= np.uint8((1 << (self.size - 8 * (len(bits) - 1))) - 1)
+        return self._like(bits)
+
+    def __eq__(self, other):
+        return isinstance(other, ComboSet) and np.array_equal(self.bits, other.bits)
+
+    def __repr__(self):
+        return f"ComboSet({len(self)} of {self.size} combos)"
@@ -0,0 +1,115 @@
+# utils/combo_features.py
+import json
+import os
+import numpy as np
+import pandas as pd
+from utils.combinadic import MAX_NUMBER, all_combos, rank
+from utils.game import HIT5
+
+FEATURE_DIR = 'data/combo_features'
+LOW_MAX = HIT5.low_max  # 1..21 are "low", 22..42 "high"
+FEATURES = ["sum", "min", "max", "spread", "evens", "odds", "lows", "highs", "max_run", "decades"]
+
+
+def compute_features(combos, max_number=MAX_NUMBER, low_max=LOW_MAX):
+    """
+    Row features of an (M, k) combo/draw array. Returns a dict of arrays:
+    sum, min, max, spread (max - min), evens, odds, lows (<= low_max), highs,
+    max_run (longest run of consecutive numbers) and decades (M x D counts of
+    numbers in 1-9, 10-19, ..., one column per decade up to max_number).
+    """
+    c = np.sort(np.asarray(combos, dtype=np.int16), axis=1)
+    picks = c.shape[1]
+    evens = (c % 2 == 0).sum(axis=1, dtype=np.uint8)
+    lows = (c <= low_max).sum(axis=1, dtype=np.uint8)
+    step = np.diff(c, axis=1) == 1
+    run = np.ones(len(c), dtype=np.uint8)
+    max_run = run.copy()
+    for j in range(picks - 1):
+        run = np.where(step[:, j], run + 1, 1).astype(np.uint8)
+        np.maximum(max_run, run, out=max_run)
+    n_decades = max_number // 10 + 1
+    decades = np.zeros((len(c), n_decades), dtype=np.uint8)
+    for j in range(picks):
+        np.add.at(decades, (np.arange(len(c)), c[:, j] // 10), 1)
+    return {
+        "sum": c.sum(axis=1, dtype=np.uint16),
+        "min": c[:, 0].astype(np.uint8),
+        "max": c[:, -1].astype(np.uint8),
+        "spread": (c[:, -1] - c[:, 0]).astype(np.uint8),
+        "evens": evens,
+        "odds": (picks - evens).astype(np.uint8),
+        "lows": lows,
+        "highs": (picks - lows).astype(np.uint8),
+        "max_run": max_run,
+        "decades": decades,
+    }
+
+
+def build_feature_table(out_dir=FEATURE_DIR, game=HIT5):
+    """
+    One-time build of the feature table for every possible ticket of the game:
+    one .npy per feature, row r holding the features of the combo with
+    combinadic rank r.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    features = compute_features(all_combos(game.picks, game.max_number), game.max_number, game.low_max)
+    for name, values in features.items():
+        path = os.path.join(out_dir, name + '.npy')
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, values)
+        os.replace(path + '.tmp', path)
+    meta = {"rows": len(features["sum"]), "max_number": game.max_number, "picks": game.picks, "low_max": game.low_max}
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    return out_dir
+
+
+def _table_game(path):
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta.get("max_number"), meta.get("picks", HIT5.picks)
+
+
+def load_feature_table(path=FEATURE_DIR, build=True, game=HIT5):
+    """
+    Maps the feature table in read-only (np.load mmap_mode='r', no copy).
+    Builds it first if it is missing (or was built for another game) and
+    build is True. Returns a dict: feature name -> memory-mapped array indexed by rank.
+    """
+    if _table_game(path) != (game.max_number, game.picks):
+        if not build:
+            raise FileNotFoundError(f"no {game.label()} feature table in {path}")
+        build_feature_table(path, game)
+    return {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r') for name in FEATURES}
+
+
+def gather(table, ranks, names=None):
+    """
+    Looks up features by combinadic rank. Returns a DataFrame with one row per
+    rank; the decade counts become columns decade_0, decade_1, ...
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    columns = {}
+    for name in names or FEATURES:
+        values = table[name][ranks]
+        if values.ndim == 2:
+            for d in range(values.shape[1]):
+                columns[f"{name[:-1]}_{d}"] = values[:, d]
+        else:
+            columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def features_for(table, combos, names=None, game=HIT5):
+    """gather() for an (M, k) array of combos (e.g. past draws) instead of ranks."""
+    return gather(table, rank(np.asarray(combos), game.max_number), names)
+
+
+if __name__ == "__main__":
+    import sys
+    out = build_feature_table(sys.argv[1] if len(sys.argv) > 1 else FEATURE_DIR)
+    print(f"Feature table written to {out}")
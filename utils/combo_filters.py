@@ -1,4 +1,8 @@
 # combo_filters.py
+from functools import lru_cache
+import numpy as np
+from utils.game import HIT5, BITMASK_LIMIT
+
 
 def valid_even_odd(combo, even_required=(2, 3)):
     """
@@ -48,3 +52,171 @@ def must_include(combo, must_nums):
     Returns True if all numbers in must_nums are present in combo.
     """
     return all(n in combo for n in must_nums)
+
+
+def passes_filters(combo, spec):
+    """
+    Scalar version of apply_filters: True if one combo passes the whole spec
+    (same keys as apply_filters). Useful as a predicate for utils.topk.
+    """
+    if spec.get("sum_range") is not None and not in_sum_range(combo, spec["sum_range"]):
+        return False
+    if spec.get("even_required") is not None and not valid_even_odd(combo, spec["even_required"]):
+        return False
+    if spec.get("must_include") and not must_include(combo, spec["must_include"]):
+        return False
+    if spec.get("recent_hits") and in_recent_hits(combo, spec["recent_hits"]):
+        return False
+    if spec.get("no_3_consecutive") and has_3_consecutive(combo):
+        return False
+    if spec.get("past_draws") is not None and in_past_draws(combo, spec["past_draws"]):
+        return False
+    return True
+
+# --- Array versions: combos is an (M, picks) array, one combo per row, or None for
+# every possible ticket of the game (utils.combinadic.all_combos order). Each returns
+# a boolean mask. Combos are reduced to uint64 bitmasks (bit n-1 = number n), so no
+# row needs sorting; the single-filter functions raise ValueError for games with
+# numbers above 64, while apply_filters falls back to per-number lookup tables.
+
+EVEN_BITS = np.uint64(sum(1 << (n - 1) for n in range(2, BITMASK_LIMIT + 1, 2)))
+
+
+@lru_cache(maxsize=4)
+def _universe_masks(game):
+    masks = _bitmasks(_universe(game), game)
+    masks.setflags(write=False)
+    return masks
+
+
+def _universe(game):
+    from utils.combinadic import all_combos
+    return all_combos(game.picks, game.max_number)
+
+
+def _bitmasks(combos, game=HIT5):
+    game.check_bitmask()
+    if combos is None:
+        return _universe_masks(game)
+    combos = np.asarray(combos, dtype=np.uint64)
+    if combos.size and combos.max() > BITMASK_LIMIT:
+        raise ValueError(f"combo numbers above {BITMASK_LIMIT} do not fit a uint64 bitmask")
+    masks = np.zeros(len(combos), dtype=np.uint64)
+    for j in range(combos.shape[1]):
+        masks |= np.uint64(1) << (combos[:, j] - np.uint64(1))
+    return masks
+
+
+def _set_mask(numbers):
+    # Numbers outside 1..64 can never be in a combo, so they add no bits
+    return np.uint64(sum(1 << (int(n) - 1) for n in numbers if 1 <= n <= BITMASK_LIMIT))
+
+
+def valid_even_odd_mask(combos, even_required=(2, 3), game=HIT5):
+    """Array version of valid_even_odd."""
+    return np.isin(np.bitwise_count(_bitmasks(combos, game) & EVEN_BITS), list(even_required))
+
+
+def has_3_consecutive_mask(combos, game=HIT5):
+    """Array version of has_3_consecutive."""
+    m = _bitmasks(combos, game)
+    return (m & (m >> np.uint64(1)) & (m >> np.uint64(2))) != 0
+
+
+def in_recent_hits_mask(combos, recent_hits, game=HIT5):
+    """Array version of in_recent_hits."""
+    return (_bitmasks(combos, game) & _set_mask(recent_hits)) != 0
+
+
+def in_past_draws_mask(combos, draws_set, game=HIT5):
+    """
+    Array version of in_past_draws. draws_set may be a set of sorted tuples
+    or a utils.combinadic.ComboSet.
+    """
+    from utils.combinadic import ComboSet
+    if not isinstance(draws_set, ComboSet):
+        draws = [d for d in draws_set if len(d) == game.picks]
+        draws_set = ComboSet.from_combos(np.array(draws), game.max_number) if draws else ComboSet.for_game(game)
+    if combos is None:
+        return draws_set.to_mask()
+    return draws_set.contains(combos)
+
+
+def in_sum_range_mask(combos, sum_range, game=HIT5):
+    """Array version of in_sum_range."""
+    combos = np.asarray(_universe(game) if combos is None else combos)
+    # Column-wise adds are much faster than a row reduction over a few columns
+    s = np.zeros(len(combos), dtype=np.int64)
+    for j in range(combos.shape[1]):
+        s += combos[:, j]
+    return (sum_range[0] <= s) & (s <= sum_range[1])
+
+
+def must_include_mask(combos, must_nums, game=HIT5):
+    """Array version of must_include."""
+    if any(not 1 <= n <= BITMASK_LIMIT for n in must_nums):
+        return np.zeros(len(_bitmasks(combos, game)), dtype=bool)
+    must = _set_mask(must_nums)
+    return (_bitmasks(combos, game) & must) == must
+
+
+def _lookup(numbers, game):
+    table = np.zeros(game.max_number + 1, dtype=bool)
+    table[[n for n in numbers if 1 <= n <= game.max_number]] = True
+    return table
+
+
+def _apply_filters_wide(spec, combos, game):
+    # apply_filters for games too wide for uint64 bitmasks (e.g. 5-of-69)
+    c = np.asarray(_universe(game) if combos is None else combos)
+    mask = np.ones(len(c), dtype=bool)
+    if spec.get("sum_range") is not None:
+        mask &= in_sum_range_mask(c, spec["sum_range"], game)
+    if spec.get("even_required") is not None:
+        evens = np.zeros(len(c), dtype=np.int64)
+        for j in range(c.shape[1]):
+            evens += c[:, j] % 2 == 0
+        mask &= np.isin(evens, list(spec["even_required"]))
+    if spec.get("must_include"):
+        must = set(spec["must_include"])
+        mask &= _lookup(must, game)[c].sum(axis=1) == len(must)
+    if spec.get("recent_hits"):
+        mask &= ~_lookup(spec["recent_hits"], game)[c].any(axis=1)
+    if spec.get("no_3_consecutive"):
+        step = np.diff(np.sort(c, axis=1).astype(np.int64), axis=1) == 1
+        mask &= ~(step[:, :-1] & step[:, 1:]).any(axis=1)
+    if spec.get("past_draws") is not None:
+        mask &= ~in_past_draws_mask(combos, spec["past_draws"], game)
+    return mask
+
+
+def apply_filters(spec, combos=None, game=HIT5):
+    """
+    Evaluates a whole filter chain at once over an (M, picks) combo array, or
+    every possible ticket of the game if combos is None. spec is a dict;
+    every key is optional:
+      even_required    - allowed even counts, e.g. (2, 3)
+      no_3_consecutive - True to drop combos with a run of 3
+      recent_hits      - drop combos containing any of these numbers
+      past_draws       - drop combos already drawn (set of tuples or ComboSet)
+      sum_range        - keep combos with min <= sum <= max
+      must_include     - keep combos containing all of these numbers
+    Returns a boolean mask of the combos that pass.
+    """
+    if not game.fits_bitmask:
+        return _apply_filters_wide(spec, combos, game)
+    masks = _bitmasks(combos, game)
+    mask = np.ones(len(masks), dtype=bool)
+    if spec.get("sum_range") is not None:
+        mask &= in_sum_range_mask(combos, spec["sum_range"], game)
+    if spec.get("even_required") is not None:
+        mask &= np.isin(np.bitwise_count(masks & EVEN_BITS), list(spec["even_required"]))
+    if spec.get("must_include"):
+        mask &= must_include_mask(combos, spec["must_include"], game)
+    if spec.get("recent_hits"):
+        mask &= (masks & _set_mask(spec["recent_hits"])) == 0
+    if spec.get("no_3_consecutive"):
+        mask &= (masks & (masks >> np.uint64(1)) & (masks >> np.uint64(2))) == 0
+    if spec.get("past_draws") is not None:
+        mask &= ~in_past_draws_mask(combos, spec["past_draws"], game)
+    return mask
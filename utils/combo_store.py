@@ -0,0 +1,169 @@
+# utils/combo_store.py
+import json
+import os
+import struct
+import numpy as np
+import pandas as pd
+from utils.combinadic import ComboSet, rank, unrank
+from utils.game import HIT5, GameSpec
+
+MAGIC = b'HIT5CMB1'
+ALIGN = 64
+VERSION = 1
+
+# File layout:
+#   MAGIC (8 bytes) | header length (uint32 LE) | JSON header, padded to a 64-byte boundary
+#   | ranks: count x uint32 LE, ascending | scores: count x float32 LE (if header["scores"])
+
+
+def _pad(n):
+    return (-n) % ALIGN
+
+
+def write_combo_list(path, combos=None, ranks=None, scores=None, params=None, game=HIT5):
+    """
+    Writes a combo list in the binary format. Pass either combos (an (M, picks)
+    array) or their combinadic ranks. Rows are stored sorted by rank; a combo
+    listed twice keeps its first score. params (JSON-serializable) records how
+    the list was generated. Returns the number of combos written.
+    """
+    if game.total_combos > 2 ** 32:
+        raise ValueError(f"{game.label()} has too many combos for uint32 ranks")
+    if ranks is None:
+        combos = np.asarray(combos)
+        ranks = rank(combos.reshape(-1, game.picks), game.max_number) if combos.size else np.empty(0, np.uint32)
+    ranks = np.asarray(ranks, dtype=np.int64)
+    ranks, first = np.unique(ranks, return_index=True)
+    header = {
+        "version": VERSION,
+        "game": {"max_number": game.max_number, "picks": game.picks,
+                 "bonus_max": game.bonus_max, "name": game.name},
+        "count": len(ranks),
+        "scores": scores is not None,
+        "params": params or {},
+    }
+    blob = json.dumps(header).encode()
+    head = MAGIC + struct.pack('<I', len(blob)) + blob
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(head + b' ' * _pad(len(head)))
+        f.write(ranks.astype('<u4').tobytes())
+        if scores is not None:
+            f.write(np.asarray(scores, dtype='<f4')[first].tobytes())
+    os.replace(tmp, path)
+    return len(ranks)
+
+
+class ComboList:
+    """
+    A binary combo list mapped read-only: ranks and scores are np.memmap views
+    of the file, so opening costs nothing beyond reading the header.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a combo list file")
+            (n,) = struct.unpack('<I', f.read(4))
+            self.header = json.loads(f.read(n))
+        self.path = path
+        self.game = GameSpec(**self.header["game"])
+        self.max_number = self.game.max_number
+        self.picks = self.game.picks
+        count = self.header["count"]
+        offset = len(MAGIC) + 4 + n
+        offset += _pad(offset)
+        if count:
+            self.ranks = np.memmap(path, dtype='<u4', mode='r', offset=offset, shape=(count,))
+            self.scores = (np.memmap(path, dtype='<f4', mode='r', offset=offset + 4 * count, shape=(count,))
+                           if self.header["scores"] else None)
+        else:
+            self.ranks = np.empty(0, dtype=np.uint32)
+            self.scores = np.empty(0, dtype=np.float32) if self.header["scores"] else None
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def combos(self):
+        """(M, picks) array of the combos, in rank order."""
+        return unrank(self.ranks, self.picks, self.max_number)
+
+    def by_score(self):
+        """(combos, scores) sorted best first (ties in rank order)."""
+        order = np.argsort(-self.scores.astype(np.float64), kind='stable')
+        return unrank(self.ranks[order], self.picks, self.max_number), np.asarray(self.scores[order])
+
+    def to_comboset(self):
+        return ComboSet.from_ranks(self.ranks, self.picks, self.max_number)
+
+    def __repr__(self):
+        return f"ComboList({self.path!r}, {len(self)} combos)"
+
+
+def read_combo_list(path):
+    return ComboList(path)
+
+
+def intersect(a, b):
+    """
+    Combos present in both lists. Returns (ranks, scores_a, scores_b); a
+    scores entry is None when that list has no scores.
+    """
+    # Both rank arrays are sorted and unique: one binary search per rank of a
+    ib = np.searchsorted(b.ranks, a.ranks)
+    found = ib < len(b.ranks)
+    found[found] = b.ranks[ib[found]] == a.ranks[found]
+    ia = np.flatnonzero(found)
+    ib = ib[ia]
+    ranks = np.asarray(a.ranks[ia])
+    return (ranks,
+            None if a.scores is None else np.asarray(a.scores[ia]),
+            None if b.scores is None else np.asarray(b.scores[ib]))
+
+
+def read_text_combos(path, game=HIT5):
+    """
+    Parses the text/CSV combo outputs: pool.py's "(a, b, c, d, e),score" lines,
+    or CSVs with Num1..Num5 and an optional Score column.
+    Returns (combos, scores or None).
+    """
+    picks = game.picks
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+        combos = df[game.number_columns].to_numpy(dtype=np.int64)
+        return combos, (df["Score"].to_numpy() if "Score" in df.columns else None)
+    with open(path) as f:
+        text = f.read()
+    values = np.array(text.translate(str.maketrans("(),", "   ")).split(), dtype=np.float64)
+    values = values.reshape(-1, picks + 1)
+    return values[:, :picks].astype(np.int64), values[:, picks]
+
+
+def convert(src, dst=None, params=None, game=HIT5):
+    """Converts a text/CSV combo output to the binary format. Returns the output path."""
+    dst = dst or os.path.splitext(src)[0] + '.cmb'
+    combos, scores = read_text_combos(src, game)
+    write_combo_list(dst, combos, scores=scores, params=dict(params or {}, source=os.path.basename(src)), game=game)
+    return dst
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Binary combo lists (.cmb).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("convert", help="convert a .txt/.csv combo output")
+    p.add_argument("src")
+    p.add_argument("dst", nargs="?")
+    p = sub.add_parser("info", help="print a combo list's header")
+    p.add_argument("path")
+    p = sub.add_parser("intersect", help="count combos present in both lists")
+    p.add_argument("a")
+    p.add_argument("b")
+    args = parser.parse_args()
+    if args.command == "convert":
+        print(f"Wrote {convert(args.src, args.dst)}")
+    elif args.command == "info":
+        print(json.dumps(read_combo_list(args.path).header, indent=2))
+    else:
+        ranks, _, _ = intersect(read_combo_list(args.a), read_combo_list(args.b))
+        print(f"{len(ranks)} combos in both lists")
@@ -0,0 +1,179 @@
+# utils/combo_stream.py
+import math
+import os
+import time
+import numpy as np
+import pandas as pd
+from utils.combinadic import unrank
+from utils.combo_filters import apply_filters
+from utils.game import HIT5
+
+CHUNK_SIZE = 65536
+
+
+class StreamStats:
+    """Per-stage counters for a combo pipeline: combos in/out and time spent in the stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def record(self, stage, n_in, n_out, seconds):
+        s = self.stages.setdefault(stage, [0, 0, 0.0])
+        s[0] += n_in
+        s[1] += n_out
+        s[2] += seconds
+
+    def out_count(self, stage):
+        return self.stages.get(stage, [0, 0, 0.0])[1]
+
+    def table(self):
+        """DataFrame: stage, combos_in, combos_out, seconds, combos_per_sec."""
+        rows = [
+            {"stage": name, "combos_in": n_in, "combos_out": n_out, "seconds": sec,
+             "combos_per_sec": n_in / sec if sec else float("nan")}
+            for name, (n_in, n_out, sec) in self.stages.items()
+        ]
+        return pd.DataFrame(rows, columns=["stage", "combos_in", "combos_out", "seconds", "combos_per_sec"])
+
+
+def _timed(stats, stage, n_in, start, n_out):
+    if stats is not None:
+        stats.record(stage, n_in, n_out, time.perf_counter() - start)
+
+
+def _lex_combos(n, picks, start, stop):
+    """Combos of range(n) with lexicographic ranks [start, stop), as 0-based rows."""
+    total = math.comb(n, picks)
+    # Lex order of a is reverse colex order of the mirrored combo n-1-a
+    mirrored = unrank(np.arange(total - 1 - start, total - 1 - stop, -1, dtype=np.int64), picks, n).astype(np.int64) - 1
+    return (n - 1 - mirrored)[:, ::-1]
+
+
+def generate(numbers, picks=HIT5.picks, chunk_size=CHUNK_SIZE, stats=None):
+    """
+    Yields every picks-combo of numbers as (M, picks) arrays of at most
+    chunk_size rows, in itertools.combinations order, without materializing
+    the whole candidate list.
+    """
+    numbers = np.asarray(list(numbers), dtype=np.int64)
+    total = math.comb(len(numbers), picks)
+    for start in range(0, total, chunk_size):
+        t = time.perf_counter()
+        chunk = numbers[_lex_combos(len(numbers), picks, start, min(start + chunk_size, total))]
+        _timed(stats, "generate", len(chunk), t, len(chunk))
+        yield chunk
+
+
+def generate_groups(groups, chunk_size=CHUNK_SIZE, stats=None):
+    """
+    Yields combos built by choosing count numbers from each (numbers, count)
+    group, in the order of nested itertools.combinations loops over the groups
+    (first group outermost). Rows are sorted; rows that would repeat a number
+    are dropped. Groups are expected to be disjoint: overlapping groups can
+    produce the same combo more than once.
+    """
+    groups = [(np.asarray(list(numbers), dtype=np.int64), count) for numbers, count in groups]
+    sizes = [math.comb(len(numbers), count) for numbers, count in groups]
+    total = math.prod(sizes)
+    for start in range(0, total, chunk_size):
+        t = time.perf_counter()
+        index = np.arange(start, min(start + chunk_size, total), dtype=np.int64)
+        parts = []
+        # Mixed-radix split of the global index: the last group varies fastest
+        for (numbers, count), size in zip(reversed(groups), reversed(sizes)):
+            index, r = np.divmod(index, size)
+            parts.append(numbers[_lex_combos(len(numbers), count, 0, size)[r]] if count else np.empty((len(r), 0), np.int64))
+        chunk = np.sort(np.hstack(parts[::-1]), axis=1)
+        chunk = chunk[(np.diff(chunk, axis=1) != 0).all(axis=1)]
+        _timed(stats, "generate", len(index), t, len(chunk))
+        yield chunk
+
+
+def filter_combos(chunks, spec, stats=None, game=HIT5):
+    """Applies an apply_filters spec to each chunk."""
+    for chunk in chunks:
+        t = time.perf_counter()
+        kept = chunk[apply_filters(spec, chunk, game)]
+        _timed(stats, "filter", len(chunk), t, len(kept))
+        yield kept
+
+
+def score_combos(chunks, scores, stats=None):
+    """
+    Yields (combos, scores) per chunk, a combo's score being the sum of its
+    numbers' scores (dict/Series number -> score; missing numbers score 0).
+    Integer scores stay integers.
+    """
+    numbers = [int(n) for n in scores.keys()]
+    values = np.asarray(list(scores.values()))
+    # Combo numbers never exceed 64 (the bitmask limit), so a 65-slot table covers them
+    table = np.zeros(max(numbers + [64]) + 1, dtype=values.dtype)
+    table[numbers] = values
+    for chunk in chunks:
+        t = time.perf_counter()
+        total = np.zeros(len(chunk), dtype=table.dtype)
+        # Add column by column, left to right, like sum() over a sorted tuple
+        for j in range(chunk.shape[1]):
+            total += table[chunk[:, j]]
+        _timed(stats, "score", len(chunk), t, len(chunk))
+        yield chunk, total
+
+
+def top_k(scored, k, stats=None):
+    """
+    Keeps the k best-scoring combos of a (combos, scores) stream, holding at
+    most k + one chunk in memory. Ties keep stream order, as a stable sort
+    would. k=None keeps everything (memory then grows with the filtered count).
+    Returns (combos, scores), best first.
+    """
+    kept_c, kept_s, kept_seq = [], [], []
+    seen = 0
+    for combos, scores in scored:
+        t = time.perf_counter()
+        kept_c.append(combos)
+        kept_s.append(scores)
+        kept_seq.append(np.arange(seen, seen + len(combos)))
+        seen += len(combos)
+        if k is not None:
+            c, s, q = np.concatenate(kept_c), np.concatenate(kept_s), np.concatenate(kept_seq)
+            if len(s) > k:
+                keep = np.lexsort((q, -s))[:k]
+                c, s, q = c[keep], s[keep], q[keep]
+            kept_c, kept_s, kept_seq = [c], [s], [q]
+        _timed(stats, "top_k", len(combos), t, sum(len(s) for s in kept_s))
+    if not kept_c:
+        return np.empty((0, 0), dtype=np.int64), np.empty(0)
+    c, s, q = np.concatenate(kept_c), np.concatenate(kept_s), np.concatenate(kept_seq)
+    order = np.lexsort((q, -s))
+    return c[order], s[order]
+
+
+def write_csv(chunks, path, stats=None):
+    """
+    Chunked writer: appends each chunk (combos, or (combos, scores)) to a CSV
+    with columns Num1..NumK[, Score], so memory stays at one chunk. The file
+    is written to a temporary name and moved into place at the end.
+    Returns the number of rows written.
+    """
+    tmp = path + '.tmp'
+    rows = 0
+    columns = None
+    header_written = False
+    with open(tmp, 'w', newline='') as f:
+        for item in chunks:
+            t = time.perf_counter()
+            combos, scores = item if isinstance(item, tuple) else (item, None)
+            frame = pd.DataFrame(combos, columns=[f"Num{j}" for j in range(1, combos.shape[1] + 1)])
+            if scores is not None:
+                frame["Score"] = scores
+            columns = list(frame.columns)
+            if len(frame) == 0:
+                continue
+            frame.to_csv(f, index=False, header=not header_written)
+            header_written = True
+            rows += len(frame)
+            _timed(stats, "write", len(frame), t, len(frame))
+        if not header_written:
+            f.write(",".join(columns or HIT5.number_columns) + "\n")
+    os.replace(tmp, path)
+    return rows
@@ -0,0 +1,139 @@
+# utils/cooccurrence.py
+import math
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from utils.game import HIT5
+
+MAX_NUMBER = HIT5.max_number
+PICKS = HIT5.picks
+
+
+def pair_counts(X):
+    """
+    42 x 42 pair co-occurrence matrix from an N x 42 incidence matrix:
+    C[a-1, b-1] is the number of draws containing both a and b, and the
+    diagonal holds each number's frequency.
+    """
+    Xi = np.asarray(X, dtype=np.int32)
+    return Xi.T @ Xi
+
+
+def triple_index(a, b, c):
+    """
+    Packed position of the triple {a, b, c} (0-based, a < b < c) in a
+    C(K, 3) vector, using the combinatorial number system.
+    """
+    a, b, c = (np.asarray(v, dtype=np.int64) for v in (a, b, c))
+    return a + b * (b - 1) // 2 + c * (c - 1) * (c - 2) // 6
+
+
+def _draw_numbers(X):
+    """(N, picks) array of 0-based drawn numbers, ascending, from an incidence matrix."""
+    X = np.asarray(X, dtype=bool)
+    per_row = X.sum(axis=1)
+    if len(X) and (per_row != per_row[0]).any():
+        raise ValueError("every draw must have the same number of balls")
+    return np.nonzero(X)[1].reshape(len(X), -1)
+
+
+def triple_counts(X):
+    """
+    Compact triple co-occurrence counts: a vector of length C(K, 3) indexed by
+    triple_index, holding how many draws contain each triple of numbers.
+    """
+    X = np.asarray(X, dtype=bool)
+    K = X.shape[1]
+    size = math.comb(K, 3)
+    if not len(X):
+        return np.zeros(size, dtype=np.int64)
+    nums = _draw_numbers(X)
+    pos = np.array(list(combinations(range(nums.shape[1]), 3)))
+    ranks = triple_index(nums[:, pos[:, 0]], nums[:, pos[:, 1]], nums[:, pos[:, 2]])
+    return np.bincount(ranks.ravel(), minlength=size)
+
+
+def triple_count(triples, a, b, c):
+    """Looks up the count for numbers a, b, c (1-based, any order)."""
+    a, b, c = sorted((a - 1, b - 1, c - 1))
+    return int(triples[triple_index(a, b, c)])
+
+
+def window_pair_counts(X, start, end):
+    """Pair counts for draws [start, end)."""
+    return pair_counts(np.asarray(X)[start:end])
+
+
+def window_triple_counts(X, start, end):
+    """Triple counts for draws [start, end)."""
+    return triple_counts(np.asarray(X)[start:end])
+
+
+class CooccurrenceState:
+    """Pair and triple counts that update in place as draws are appended."""
+
+    def __init__(self, max_number=MAX_NUMBER):
+        self.max_number = max_number
+        self.n_draws = 0
+        self.pairs = np.zeros((max_number, max_number), dtype=np.int64)
+        self.triples = np.zeros(math.comb(max_number, 3), dtype=np.int64)
+
+    @classmethod
+    def from_incidence(cls, X):
+        state = cls(np.asarray(X).shape[1])
+        state.pairs += pair_counts(X)
+        state.triples += triple_counts(X)
+        state.n_draws = len(X)
+        return state
+
+    def push(self, draw):
+        """Adds one draw (an iterable of ball numbers)."""
+        idx = np.unique(np.asarray(draw, dtype=np.int64)) - 1
+        self.pairs[np.ix_(idx, idx)] += 1
+        if len(idx) >= 3:
+            t = np.array(list(combinations(idx, 3)))
+            self.triples[triple_index(t[:, 0], t[:, 1], t[:, 2])] += 1
+        self.n_draws += 1
+
+
+def _hypergeom_both(k, picks, max_number):
+    """Probability that k given numbers are all in one picks-of-max_number draw."""
+    return math.comb(max_number - k, picks - k) / math.comb(max_number, picks)
+
+
+def pair_residuals(pairs, n_draws, picks=PICKS):
+    """
+    Standardized residuals (O - E) / sqrt(E (1 - p)) of pair counts against the
+    hypergeometric expectation E = n_draws * p. The diagonal compares single
+    number frequencies with their own expectation.
+    """
+    K = pairs.shape[0]
+    p = np.full((K, K), _hypergeom_both(2, picks, K))
+    np.fill_diagonal(p, _hypergeom_both(1, picks, K))
+    expected = n_draws * p
+    return (pairs - expected) / np.sqrt(expected * (1 - p))
+
+
+def triple_residuals(triples, n_draws, max_number=MAX_NUMBER, picks=PICKS):
+    """Standardized residuals of triple counts against the hypergeometric expectation."""
+    p = _hypergeom_both(3, picks, max_number)
+    expected = n_draws * p
+    return (triples - expected) / np.sqrt(expected * (1 - p))
+
+
+def top_pairs(pairs, n_draws, n=10, picks=PICKS):
+    """
+    Returns a DataFrame of the n pairs that appear together most often
+    relative to chance (largest standardized residual).
+    """
+    z = pair_residuals(pairs, n_draws, picks)
+    a, b = np.triu_indices(pairs.shape[0], k=1)
+    order = np.argsort(z[a, b], kind='stable')[::-1][:n]
+    p = _hypergeom_both(2, picks, pairs.shape[0])
+    return pd.DataFrame({
+        "Number A": a[order] + 1,
+        "Number B": b[order] + 1,
+        "Count": pairs[a[order], b[order]],
+        "Expected": n_draws * p,
+        "Z": z[a[order], b[order]],
+    })
@@ -0,0 +1,97 @@
+# utils/draw_index.py
+import numpy as np
+import pandas as pd
+from utils.draw_store import DATE_FORMAT
+from utils.memo import StatsCache, fingerprint
+
+# DrawIndex per distinct date column, so repeated window lookups on the same
+# frame skip re-parsing and re-sorting its dates
+_indexes = StatsCache(maxsize=32)
+
+
+def parse_dates(dates):
+    """Parses draw dates ("Fri, Apr 01, 2022" strings or datetimes) to datetime64[D]."""
+    dates = pd.Series(dates)
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format=DATE_FORMAT)
+    return dates.to_numpy().astype('datetime64[D]')
+
+
+class DrawIndex:
+    """
+    Chronological index over draw dates.
+    Lookups binary-search the sorted dates and return row positions (in date
+    order) that can be passed to DataFrame.iloc or used on NumPy arrays.
+    When the rows are already in date order no sort is done and lookups
+    return slices.
+    """
+
+    def __init__(self, dates):
+        days = np.asarray(dates, dtype='datetime64[D]')
+        if len(days) < 2 or not (days[1:] < days[:-1]).any():
+            self.order = None
+            self.days = days
+        else:
+            self.order = np.argsort(days, kind='stable')
+            self.days = days[self.order]
+
+    @classmethod
+    def from_frame(cls, df, date_column='Date'):
+        return cls(parse_dates(df[date_column]))
+
+    def __len__(self):
+        return len(self.days)
+
+    def _rows(self, lo, hi):
+        if self.order is None:
+            return slice(lo, hi)
+        return self.order[lo:hi]
+
+    def position(self, as_of):
+        """Number of draws on or before as_of."""
+        return int(np.searchsorted(self.days, np.datetime64(as_of, 'D'), side='right'))
+
+    def between(self, start, end):
+        """Rows of draws with start <= date <= end (either bound may be None)."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, np.datetime64(start, 'D'), side='left'))
+        hi = len(self.days) if end is None else self.position(end)
+        return self._rows(lo, max(lo, hi))
+
+    def last(self, k, as_of=None):
+        """Rows of the last k draws on or before as_of (the whole history if as_of is None)."""
+        hi = len(self.days) if as_of is None else self.position(as_of)
+        return self._rows(max(0, hi - k), hi)
+
+    def chronological(self):
+        """Rows of every draw in date order."""
+        return self._rows(0, len(self.days))
+
+
+def frame_index(df, date_column='Date'):
+    """
+    DrawIndex of df's date column, built once per distinct column and cached
+    on its fingerprint (a hash of the values, far cheaper than parsing and
+    sorting them), so window lookups are binary searches. The index is
+    shared, so treat it as read-only.
+    """
+    key = fingerprint(df, [date_column])
+    found, index = _indexes.get(key)
+    if not found:
+        index = DrawIndex.from_frame(df, date_column)
+        _indexes.put(key, index)
+    return index
+
+
+def window_frame(df, window=None, as_of=None, date_column='Date'):
+    """
+    Returns the last `window` draws of df on or before `as_of` (all draws
+    when both are None), in date order.
+    Frames without a date column fall back to positional tail(window).
+    """
+    if date_column not in df.columns:
+        return df if window is None else df.tail(window)
+    index = frame_index(df, date_column)
+    rows = index.last(len(df) if window is None else window, as_of)
+    if isinstance(rows, slice) and rows == slice(0, len(df)):
+        return df
+    return df.iloc[rows]
@@ -0,0 +1,112 @@
+# utils/draw_parser.py
+from html.parser import HTMLParser
+from utils.game import HIT5
+
+
+def _has_class(attrs, name):
+    for key, value in attrs:
+        if key == 'class' and value and name in value.split():
+            return True
+    return False
+
+
+class _DrawPageParser(HTMLParser):
+    """
+    Single streaming pass over a PastDrawings page.
+    Each <p class="h2-like"> date belongs to its enclosing <table>; every
+    <td class="game-balls"> inside that table (nested tables included) is
+    a candidate draw for the date. Rows are collected when the table closes.
+    """
+
+    def __init__(self, max_number, picks):
+        super().__init__(convert_charrefs=True)
+        self.max_number = max_number
+        self.picks = picks
+        self.tables = []        # stack of {"dates": [(seq, date)], "balls": [[str]]}
+        self.rows_by_date = {}  # date seq -> (date, list of ball lists)
+        self.n_dates = 0
+        self.date_text = None   # text pieces while inside p.h2-like
+        self.p_depth = 0
+        self.balls = None       # li texts while inside td.game-balls
+        self.td_depth = 0
+        self.li_text = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.tables.append({"dates": [], "balls": []})
+        elif tag == 'p':
+            if self.date_text is not None:
+                self.p_depth += 1
+            elif _has_class(attrs, 'h2-like'):
+                self.date_text = []
+                self.p_depth = 1
+        elif tag == 'td':
+            if self.balls is not None:
+                self.td_depth += 1
+            elif _has_class(attrs, 'game-balls'):
+                self.balls = []
+                self.td_depth = 1
+        elif tag == 'li' and self.balls is not None:
+            self.li_text = []
+
+    def handle_endtag(self, tag):
+        if tag == 'p' and self.date_text is not None:
+            self.p_depth -= 1
+            if self.p_depth == 0:
+                if self.tables:
+                    self.tables[-1]["dates"].append((self.n_dates, ''.join(self.date_text)))
+                    self.n_dates += 1
+                self.date_text = None
+        elif tag == 'li' and self.li_text is not None:
+            self.balls.append(''.join(self.li_text))
+            self.li_text = None
+        elif tag == 'td' and self.balls is not None:
+            self.td_depth -= 1
+            if self.td_depth == 0:
+                if self.tables:
+                    self.tables[-1]["balls"].append(self.balls)
+                self.balls = None
+        elif tag == 'table' and self.tables:
+            table = self.tables.pop()
+            draws = []
+            for texts in table["balls"]:
+                nums = [n for n in texts if n.isdigit() and 1 <= int(n) <= self.max_number]
+                if len(nums) == self.picks:
+                    draws.append(nums)
+            for seq, date in table["dates"]:
+                self.rows_by_date[seq] = (date, draws)
+            if self.tables:
+                # find_all() on an outer table also sees balls in nested tables
+                self.tables[-1]["balls"].extend(table["balls"])
+
+    def handle_data(self, data):
+        piece = data.strip()
+        if not piece:
+            return
+        if self.date_text is not None:
+            self.date_text.append(piece)
+        if self.li_text is not None:
+            self.li_text.append(piece)
+
+
+def parse_draw_page(html, max_number=HIT5.max_number, picks=HIT5.picks):
+    """
+    Extracts [Date, Num1..Num5] rows (numbers as strings, as on the page)
+    from a WA Lottery PastDrawings page in one streaming pass. Rows come out
+    in page order with exact duplicates removed.
+    """
+    parser = _DrawPageParser(max_number, picks)
+    parser.feed(html)
+    parser.close()
+    while parser.tables:
+        # Unclosed tables at EOF still own their dates
+        parser.handle_endtag('table')
+    results, seen = [], set()
+    for seq in sorted(parser.rows_by_date):
+        date, draws = parser.rows_by_date[seq]
+        for nums in draws:
+            row = tuple([date] + nums)
+            if row not in seen:
+                seen.add(row)
+                results.append(list(row))
+    return results
@@ -0,0 +1,149 @@
+# utils/draw_store.py
+import os
+import numpy as np
+import pandas as pd
+from utils.game import HIT5, GAMES, BITMASK_LIMIT
+
+NUMBER_COLUMNS = HIT5.number_columns
+DATE_FORMAT = "%a, %b %d, %Y"
+DEFAULT_PATH = 'data/hit5_all_history.csv'
+
+
+def draw_dtype(game=HIT5):
+    """
+    One record per draw: day number, the game.picks balls as drawn, the bonus
+    ball (games that have one) and, for games of up to 64 numbers, a bitmask
+    with bit (n - 1) set for every number n in the draw.
+    """
+    fields = [('day', 'datetime64[D]'), ('balls', 'u1' if game.max_number < 256 else '<u2', (game.picks,))]
+    if game.bonus_max is not None:
+        fields.append(('bonus', 'u1' if game.bonus_max < 256 else '<u2'))
+    if game.fits_bitmask:
+        fields.append(('mask', '<u8'))
+    return np.dtype(fields)
+
+
+DRAW_DTYPE = draw_dtype(HIT5)
+
+
+def store_path(csv_path):
+    """Returns the binary store path that sits next to a draw CSV."""
+    return os.path.splitext(csv_path)[0] + '.npy'
+
+
+def balls_to_mask(balls):
+    """
+    Converts an (N, picks) array of ball numbers to N uint64 bitmasks
+    (bit n-1 set for each number n).
+    """
+    balls = np.asarray(balls, dtype=np.uint64)
+    if balls.size and balls.max() > BITMASK_LIMIT:
+        raise ValueError(f"ball numbers above {BITMASK_LIMIT} do not fit a uint64 bitmask")
+    return np.bitwise_or.reduce(np.uint64(1) << (balls - np.uint64(1)), axis=1)
+
+
+def check_columns(columns, game=HIT5):
+    """
+    Raises ValueError unless a draw table's ball columns are exactly
+    game.number_columns (plus the bonus column for games that have one).
+    """
+    expected = game.number_columns + ([game.bonus_column] if game.bonus_column else [])
+    found = [c for c in columns if c == "Bonus" or (c.startswith("Num") and c[3:].isdigit())]
+    if sorted(found) != sorted(expected):
+        raise ValueError(f"draw columns {found} do not match {game.label()} ({', '.join(expected)})")
+
+
+def draws_to_records(dates, balls, bonus=None, game=HIT5):
+    """Packs parsed dates and an (N, picks) ball array into a draw_dtype(game) record array."""
+    balls = np.asarray(balls)
+    if balls.ndim != 2 or balls.shape[1] != game.picks:
+        raise ValueError(f"{game.label()} draws need {game.picks} balls, got shape {balls.shape}")
+    if balls.size and (balls.min() < 1 or balls.max() > game.max_number):
+        raise ValueError(f"ball numbers must be between 1 and {game.max_number}")
+    records = np.empty(len(balls), dtype=draw_dtype(game))
+    records['day'] = np.asarray(dates, dtype='datetime64[D]')
+    records['balls'] = balls
+    if game.bonus_max is not None:
+        bonus = np.asarray(bonus)
+        if bonus.size and (bonus.min() < 1 or bonus.max() > game.bonus_max):
+            raise ValueError(f"bonus numbers must be between 1 and {game.bonus_max}")
+        records['bonus'] = bonus
+    if game.fits_bitmask:
+        records['mask'] = balls_to_mask(balls)
+    return records
+
+
+def convert_csv(csv_path, out_path=None, game=HIT5):
+    """
+    One-shot conversion of a draw CSV (Date, Num1..NumK[, Bonus]) into the
+    binary store. Raises ValueError if the CSV's ball columns do not match
+    the game. Records are stored in chronological order. The file is written
+    to a temporary name and moved into place, so readers never see a
+    half-written store. Returns the store path.
+    """
+    out_path = out_path or store_path(csv_path)
+    df = pd.read_csv(csv_path)
+    check_columns(df.columns, game)
+    dates = pd.to_datetime(df['Date'], format=DATE_FORMAT)
+    bonus = df[game.bonus_column].to_numpy() if game.bonus_column else None
+    records = draws_to_records(dates.to_numpy(), df[game.number_columns].to_numpy(), bonus, game)
+    records = records[np.argsort(records['day'], kind='stable')]
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, records)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def open_store(path, game=HIT5):
+    """Memory-maps a binary draw store as a read-only draw_dtype(game) record array."""
+    records = np.load(path, mmap_mode='r')
+    if records.dtype != draw_dtype(game):
+        raise ValueError(f"{path} is not a {game.label()} draw store (dtype {records.dtype})")
+    return records
+
+
+def load_records(path=DEFAULT_PATH, game=HIT5):
+    """
+    Returns the memory-mapped draw records for a CSV or .npy path.
+    For a CSV, the sibling store is (re)built first if it is missing, older
+    than the CSV or was built for another game.
+    """
+    if path.endswith('.npy'):
+        return open_store(path, game)
+    npy_path = store_path(path)
+    if not os.path.exists(npy_path) or os.path.getmtime(npy_path) < os.path.getmtime(path):
+        convert_csv(path, npy_path, game)
+    try:
+        return open_store(npy_path, game)
+    except ValueError:
+        convert_csv(path, npy_path, game)
+        return open_store(npy_path, game)
+
+
+def load_draws(path=DEFAULT_PATH, game=HIT5):
+    """
+    Loads draws, oldest first, as a DataFrame with a parsed Date column,
+    integer Num1..NumK columns (and Bonus for games that have one), backed
+    by the binary store instead of re-parsing the CSV.
+    """
+    records = load_records(path, game)
+    data = {'Date': records['day'].astype('datetime64[ns]')}
+    balls = records['balls']
+    for i, col in enumerate(game.number_columns):
+        data[col] = balls[:, i].astype(np.int64)
+    if game.bonus_column:
+        data[game.bonus_column] = records['bonus'].astype(np.int64)
+    return pd.DataFrame(data)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert draw CSV files into binary draw stores.")
+    parser.add_argument("csv_files", nargs="*", default=[DEFAULT_PATH], help="Draw CSV files to convert")
+    parser.add_argument("--game", choices=sorted(GAMES), default="hit5")
+    args = parser.parse_args()
+    game = GAMES[args.game]
+    for csv_file in args.csv_files:
+        out = convert_csv(csv_file, game=game)
+        print(f"{csv_file} -> {out} ({len(open_store(out, game))} draws)")
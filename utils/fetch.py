@@ -0,0 +1,60 @@
+# utils/fetch.py
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE = "https://www.walottery.com/WinningNumbers/PastDrawings.aspx"
+
+
+def make_session(pool_size=6, retries=3, backoff=0.5):
+    """
+    Returns a keep-alive requests.Session whose connection pool holds
+    pool_size connections and that retries failed GETs with exponential
+    backoff (backoff, 2*backoff, 4*backoff, ... seconds).
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def year_params(year):
+    return {"gamename": "hit5", "unittype": "year", "unitcount": year}
+
+
+def fetch_page(session, params, base=BASE, timeout=30, cache=None):
+    """
+    GETs one PastDrawings page and returns its HTML text.
+    If a PageCache is given, the page is served/revalidated through it.
+    """
+    if cache is not None:
+        return cache.get(session, base, params, timeout=timeout)
+    r = session.get(base, params=params, timeout=timeout)
+    r.raise_for_status()
+    return r.text
+
+
+def fetch_years(years, parse, base=BASE, max_workers=6, session=None, cache=None):
+    """
+    Fetches and parses the yearly result pages concurrently, with at most
+    max_workers requests in flight over one shared session.
+    parse(html) must return a list of rows. Rows are merged in year order,
+    so the result does not depend on which request finishes first.
+    """
+    years = sorted(years)
+    session = session or make_session(pool_size=max_workers)
+
+    def fetch_one(year):
+        return parse(fetch_page(session, year_params(year), base=base, cache=cache))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        per_year = list(pool.map(fetch_one, years))
+    return [row for rows in per_year for row in rows]
@@ -0,0 +1,73 @@
+# utils/game.py
+import math
+from dataclasses import dataclass
+
+# Per-draw bitmasks (bit n-1 = number n) are stored in uint64
+BITMASK_LIMIT = 64
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """
+    Shape of a lottery game: picks numbers drawn from 1..max_number, plus an
+    optional bonus ball from 1..bonus_max. Stats, combo and backtest code size
+    their data structures from it instead of assuming 5-of-42.
+    """
+    max_number: int
+    picks: int
+    bonus_max: int = None
+    name: str = ""
+
+    def __post_init__(self):
+        if not 0 < self.picks <= self.max_number:
+            raise ValueError(f"picks must be in 1..max_number, got {self.picks} of {self.max_number}")
+        if self.bonus_max is not None and self.bonus_max < 1:
+            raise ValueError("bonus_max must be at least 1")
+
+    @property
+    def numbers(self):
+        """range(1, max_number + 1)"""
+        return range(1, self.max_number + 1)
+
+    @property
+    def number_columns(self):
+        """Draw DataFrame columns: Num1..Num<picks>."""
+        return [f"Num{i}" for i in range(1, self.picks + 1)]
+
+    @property
+    def bonus_column(self):
+        return "Bonus" if self.bonus_max is not None else None
+
+    @property
+    def total_combos(self):
+        """Number of possible tickets, C(max_number, picks)."""
+        return math.comb(self.max_number, self.picks)
+
+    @property
+    def hit_probability(self):
+        """Chance a given number is in one draw: picks / max_number."""
+        return self.picks / self.max_number
+
+    @property
+    def low_max(self):
+        """Largest "low" number (the bottom half of the range)."""
+        return self.max_number // 2
+
+    @property
+    def fits_bitmask(self):
+        return self.max_number <= BITMASK_LIMIT
+
+    def check_bitmask(self):
+        """Raises ValueError if draws cannot be packed into uint64 bitmasks."""
+        if not self.fits_bitmask:
+            raise ValueError(f"{self.label()} has numbers above {BITMASK_LIMIT}; bitmask code supports at most {BITMASK_LIMIT}")
+
+    def label(self):
+        return self.name or f"{self.picks}-of-{self.max_number}"
+
+
+HIT5 = GameSpec(42, 5, name="Hit 5")
+LOTTO_6_49 = GameSpec(49, 6, name="Lotto 6/49")
+POWERBALL = GameSpec(69, 5, bonus_max=26, name="Powerball")
+
+GAMES = {"hit5": HIT5, "lotto649": LOTTO_6_49, "powerball": POWERBALL}
@@ -0,0 +1,101 @@
+# utils/http_cache.py
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+CACHE_DIR = 'data/.http_cache'
+
+
+class PageCache:
+    """
+    On-disk cache for PastDrawings.aspx pages.
+    Bodies are stored gzip-compressed, keyed by URL and query params.
+    A year page fetched after that year ended can no longer change and is
+    served from disk without touching the network. Everything else (a year
+    page fetched while the year was still running, "last N days" pages) is
+    revalidated with If-None-Match / If-Modified-Since and re-stamped, so a
+    finished year is checked once more before it is frozen. `stats` counts
+    hits (served from disk), revalidated (304 Not Modified) and misses
+    (full download).
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def key(self, base, params):
+        raw = json.dumps([base, sorted((str(k), str(v)) for k, v in params.items())])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def is_immutable(self, params, meta):
+        """True for a year page whose stored copy was fetched after that year ended."""
+        if params.get("unittype") != "year" or not meta or "unitcount" not in params:
+            return False
+        # A day's margin past New Year covers the results site's time zone
+        year_end = datetime(int(params["unitcount"]) + 1, 1, 2).timestamp()
+        return meta.get("fetched_at", 0) >= year_end
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.html.gz'
+
+    def _load(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rt', encoding='utf-8') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, key, meta, text=None):
+        """Writes the body (if given), then the metadata that points at it."""
+        meta_path, body_path = self._paths(key)
+        if text is not None:
+            with gzip.open(body_path + '.tmp', 'wt', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(body_path + '.tmp', body_path)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def get(self, session, base, params, timeout=30):
+        """Returns the page HTML, from disk when possible."""
+        key = self.key(base, params)
+        meta, text = self._load(key)
+        if text is not None and self.is_immutable(params, meta):
+            self._count("hits")
+            return text
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        r = session.get(base, params=params, headers=headers, timeout=timeout)
+        if r.status_code == 304 and text is not None:
+            self._count("revalidated")
+            self._store(key, dict(meta, fetched_at=time.time()))
+            return text
+        r.raise_for_status()
+        self._count("misses")
+        self._store(key, {
+            "base": base,
+            "params": {str(k): str(v) for k, v in params.items()},
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }, r.text)
+        return r.text
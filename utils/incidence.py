@@ -0,0 +1,68 @@
+# utils/incidence.py
+import numpy as np
+from utils.game import HIT5, BITMASK_LIMIT
+
+MAX_NUMBER = HIT5.max_number
+
+
+def incidence_matrix(df, number_columns, max_number=MAX_NUMBER):
+    """
+    Builds an N x max_number boolean matrix: X[i, n-1] is True if number n
+    was drawn in row i. Values outside 1..max_number (or missing) are ignored.
+    """
+    values = df[number_columns].to_numpy(dtype=float, na_value=np.nan)
+    X = np.zeros((len(values), max_number), dtype=bool)
+    valid = np.isfinite(values) & (values >= 1) & (values <= max_number)
+    rows, cols = np.nonzero(valid)
+    X[rows, values[rows, cols].astype(np.intp) - 1] = True
+    return X
+
+
+def incidence_from_masks(masks, max_number=MAX_NUMBER):
+    """Builds the same boolean matrix from per-draw uint64 bitmasks (bit n-1 = number n)."""
+    if max_number > BITMASK_LIMIT:
+        raise ValueError(f"bitmasks hold numbers up to {BITMASK_LIMIT}, not {max_number}")
+    masks = np.asarray(masks, dtype=np.uint64)
+    bits = np.arange(max_number, dtype=np.uint64)
+    return ((masks[:, None] >> bits) & np.uint64(1)).astype(bool)
+
+
+def frequencies(X):
+    """Returns an array of hit counts per number (index 0 is number 1)."""
+    return X.sum(axis=0)
+
+
+def _number_gaps(X):
+    """Returns (numbers, gaps): every hit as a 0-based number and its gap, grouped by number."""
+    # Column-major nonzero gives hits grouped by number, in row order
+    numbers, rows = np.nonzero(X.T)
+    gaps = np.diff(rows, prepend=0)
+    starts = np.flatnonzero(np.diff(numbers, prepend=-1))
+    gaps[starts] = rows[starts]
+    return numbers, gaps
+
+
+def hit_gaps(X):
+    """
+    Returns a list of gap arrays, one per number, using the same convention as
+    lottery_stats.calculate_gaps: the first gap is the index of the first hit,
+    the rest are differences between consecutive hit indices.
+    """
+    numbers, gaps = _number_gaps(X)
+    bounds = np.searchsorted(numbers, np.arange(X.shape[1] + 1))
+    return [gaps[bounds[k]:bounds[k + 1]] for k in range(X.shape[1])]
+
+
+def last_seen(X):
+    """Returns the row index of the most recent hit per number (-1 if never drawn)."""
+    hit = X.any(axis=0)
+    last = len(X) - 1 - np.argmax(X[::-1], axis=0)
+    return np.where(hit, last, -1)
+
+
+def longest_gaps(X):
+    """Returns the longest gap per number (0 if never drawn), as in lottery_stats.longest_gap_per_number."""
+    numbers, gaps = _number_gaps(X)
+    longest = np.zeros(X.shape[1], dtype=np.int64)
+    np.maximum.at(longest, numbers, gaps)
+    return longest
@@ -0,0 +1,247 @@
+# utils/ingest.py
+import csv
+import io
+import json
+import os
+import zlib
+import numpy as np
+import pandas as pd
+from utils.draw_store import DATE_FORMAT, balls_to_mask, check_columns
+from utils.combinadic import rank
+from utils.game import HIT5, GAMES
+from utils import memo
+
+TAIL_BYTES = 256
+# Keys keep the day number in the top 16 bits, so ball bitmasks fit games of
+# up to 48 numbers; larger games key on the combo's combinadic rank instead
+KEY_MASK_BITS = 48
+
+
+def header(game=HIT5):
+    """CSV header of a game's history file: Date, Num1..NumK[, Bonus]."""
+    return ["Date"] + game.number_columns + ([game.bonus_column] if game.bonus_column else [])
+
+
+def keys_path(csv_path):
+    """Dedup key index: one uint64 key per committed row, sorted ascending."""
+    return os.path.splitext(csv_path)[0] + '.keys'
+
+
+def commit_path(csv_path):
+    """Commit record: how many bytes/rows of the CSV the key index covers."""
+    return os.path.splitext(csv_path)[0] + '.commit.json'
+
+
+def draw_keys(dates, balls, game=HIT5):
+    """
+    Returns one uint64 dedup key per draw: the day number in the high bits and
+    the canonical (order-independent) ball bitmask in the low max_number bits.
+    Games above KEY_MASK_BITS numbers use day * total_combos + combo rank.
+    """
+    days = pd.to_datetime(pd.Series(dates), format=DATE_FORMAT).to_numpy().astype('datetime64[D]')
+    days = days.astype(np.int64).astype(np.uint64)
+    balls = np.asarray(balls, dtype=np.int64).reshape(-1, game.picks)
+    if game.max_number <= KEY_MASK_BITS:
+        return (days << np.uint64(game.max_number)) | balls_to_mask(balls)
+    return days * np.uint64(game.total_combos) + rank(balls, game.max_number).astype(np.uint64)
+
+
+def _fsync_write(path, data, mode='wb'):
+    with open(path, mode) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _tail_crc(csv_path, size):
+    with open(csv_path, 'rb') as f:
+        f.seek(max(0, size - TAIL_BYTES))
+        return zlib.crc32(f.read(size - max(0, size - TAIL_BYTES)))
+
+
+def _write_commit(csv_path, size, rows):
+    record = {"csv_bytes": size, "rows": rows, "tail_crc": _tail_crc(csv_path, size), "sorted": True}
+    tmp = commit_path(csv_path) + '.tmp'
+    _fsync_write(tmp, json.dumps(record).encode())
+    os.replace(tmp, commit_path(csv_path))
+
+
+def _parse_rows(text, game=HIT5):
+    """Parses CSV text (no header) into (dates, balls)."""
+    rows = [r for r in csv.reader(io.StringIO(text)) if r]
+    dates = [r[0] for r in rows]
+    balls = np.array([[int(n) for n in r[1:1 + game.picks]] for r in rows], dtype=np.int64).reshape(-1, game.picks)
+    return dates, balls
+
+
+def rebuild_index(csv_path, game=HIT5):
+    """Recomputes the key index for the whole CSV (O(history)). Returns the sorted keys."""
+    df = pd.read_csv(csv_path)
+    check_columns(df.columns, game)
+    keys = draw_keys(df["Date"], df[game.number_columns].to_numpy(), game) if len(df) else np.empty(0, np.uint64)
+    keys = np.sort(keys).astype('<u8')
+    _fsync_write(keys_path(csv_path), keys.tobytes())
+    _write_commit(csv_path, os.path.getsize(csv_path), len(keys))
+    return keys
+
+
+def _map_keys(csv_path, rows):
+    """Read-only memory map of the sorted key file (nothing is read until indexed)."""
+    if rows == 0:
+        return np.empty(0, dtype='<u8')
+    return np.memmap(keys_path(csv_path), dtype='<u8', mode='r', shape=(rows,))
+
+
+def _add_keys(csv_path, keys, new_keys):
+    """
+    Adds new_keys to the sorted key file. Keys lead with the day number, so
+    new draws normally sort after every stored key and are simply appended
+    (O(new rows)); back-filled older draws are merged in and the file is
+    replaced. Returns the new key count.
+    """
+    new_keys = np.sort(np.asarray(new_keys, dtype=np.uint64)).astype('<u8')
+    if not len(keys) or new_keys[0] >= keys[-1]:
+        _fsync_write(keys_path(csv_path), new_keys.tobytes(), mode='ab')
+    else:
+        merged = np.insert(np.asarray(keys), np.searchsorted(keys, new_keys), new_keys)
+        tmp = keys_path(csv_path) + '.tmp'
+        _fsync_write(tmp, merged.tobytes())
+        os.replace(tmp, keys_path(csv_path))
+    return len(keys) + len(new_keys)
+
+
+def _drop_partial_line(csv_path, committed):
+    """
+    Truncates an unterminated last line left behind by an interrupted append.
+    Only bytes past the committed size are touched; the committed rows stay
+    even when the file does not end with a newline.
+    """
+    size = os.path.getsize(csv_path)
+    if size <= committed:
+        return size
+    with open(csv_path, 'rb+') as f:
+        f.seek(committed)
+        tail = f.read()
+        if tail.endswith(b'\n'):
+            return size
+        cut = committed + tail.rfind(b'\n') + 1
+        f.truncate(cut)
+        f.flush()
+        os.fsync(f.fileno())
+        return cut
+
+
+def open_index(csv_path, game=HIT5):
+    """
+    Opens the sorted key index as a memory map, recovering from an
+    interrupted append first. Only the commit record, the key file's size
+    and the CSV's committed tail are checked, so opening costs O(1) reads.
+    Complete rows written after the last commit are indexed; a trailing
+    partial line is dropped. If the committed part of the CSV was changed
+    outside this module (or the index predates sorted key files), the index
+    is rebuilt from scratch.
+    """
+    try:
+        with open(commit_path(csv_path)) as f:
+            commit = json.load(f)
+        n_keys = os.path.getsize(keys_path(csv_path)) // 8
+    except (OSError, ValueError):
+        return rebuild_index(csv_path, game)
+    size = os.path.getsize(csv_path)
+    if (not commit.get("sorted") or size < commit["csv_bytes"] or n_keys != commit["rows"]
+            or _tail_crc(csv_path, commit["csv_bytes"]) != commit["tail_crc"]):
+        return rebuild_index(csv_path, game)
+    if size > commit["csv_bytes"]:
+        size = _drop_partial_line(csv_path, commit["csv_bytes"])
+        with open(csv_path, 'rb') as f:
+            f.seek(commit["csv_bytes"])
+            dates, balls = _parse_rows(f.read().decode(), game)
+        if len(dates):
+            n_keys = _add_keys(csv_path, _map_keys(csv_path, n_keys), draw_keys(dates, balls, game))
+        _write_commit(csv_path, size, n_keys)
+    return _map_keys(csv_path, n_keys)
+
+
+def append_draws(csv_path, rows, game=HIT5):
+    """
+    Appends [Date, Num1..NumK[, Bonus]] rows that are not already in the history.
+    The new rows' keys are binary-searched in the memory-mapped key index,
+    so an append costs O(new rows) (plus log(history) lookups). Only the new
+    rows are written: CSV lines first, then their keys, then an atomically
+    replaced commit record, each fsync'd. A crash at any point leaves the
+    committed history intact. Returns the number of rows added.
+    """
+    if not os.path.exists(csv_path):
+        _fsync_write(csv_path, (",".join(header(game)) + "\n").encode())
+    keys = open_index(csv_path, game)
+    if not rows:
+        return 0
+    width = len(header(game))
+    if any(len(r) != width for r in rows):
+        raise ValueError(f"{game.label()} rows need {width} fields: {', '.join(header(game))}")
+    dates = [r[0] for r in rows]
+    balls = np.array([[int(n) for n in r[1:1 + game.picks]] for r in rows], dtype=np.int64)
+    new_keys = draw_keys(dates, balls, game)
+    # First occurrence of each new key, in row order, that the index lacks
+    _, first = np.unique(new_keys, return_index=True)
+    first.sort()
+    found = np.zeros(len(first), dtype=bool)
+    if len(keys):
+        pos = np.searchsorted(keys, new_keys[first])
+        found = (pos < len(keys)) & (keys[np.minimum(pos, len(keys) - 1)] == new_keys[first])
+    keep = first[~found].tolist()
+    if not keep:
+        return 0
+
+    # open_index has committed the whole file; terminate its last row if needed
+    size = os.path.getsize(csv_path)
+    with open(csv_path, 'rb') as f:
+        f.seek(max(0, size - 1))
+        buf = io.StringIO("" if f.read(1) in (b'', b'\n') else "\n")
+    buf.seek(0, io.SEEK_END)
+    writer = csv.writer(buf, lineterminator="\n")
+    for i in keep:
+        writer.writerow([dates[i]] + balls[i].tolist() + [int(n) for n in rows[i][1 + game.picks:]])
+    _fsync_write(csv_path, buf.getvalue().encode(), mode='ab')
+    n_keys = _add_keys(csv_path, keys, new_keys[keep])
+    _write_commit(csv_path, size + len(buf.getvalue().encode()), n_keys)
+    memo.invalidate()
+    return len(keep)
+
+
+def compact(csv_path, game=HIT5):
+    """
+    Rewrites the history as the canonical file: duplicates removed and draws
+    sorted chronologically. The new file replaces the old one atomically and
+    the key index is rebuilt. Returns the number of draws kept.
+    """
+    df = pd.read_csv(csv_path)
+    check_columns(df.columns, game)
+    df["_key"] = draw_keys(df["Date"], df[game.number_columns].to_numpy(), game)
+    df = (
+        df.drop_duplicates(subset="_key")
+          .sort_values("Date", key=lambda d: pd.to_datetime(d, format=DATE_FORMAT), kind="stable")
+          .drop(columns="_key")
+    )
+    tmp = csv_path + '.tmp'
+    df.to_csv(tmp, index=False)
+    with open(tmp, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, csv_path)
+    rebuild_index(csv_path, game)
+    memo.invalidate()
+    return len(df)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Maintain the append-only Hit 5 history file.")
+    parser.add_argument("command", choices=["compact", "reindex"])
+    parser.add_argument("csv_file", nargs="?", default="data/hit5_all_history.csv")
+    parser.add_argument("--game", choices=sorted(GAMES), default="hit5")
+    args = parser.parse_args()
+    game = GAMES[args.game]
+    if args.command == "compact":
+        print(f"Compacted {args.csv_file}: {compact(args.csv_file, game)} draws")
+    else:
+        print(f"Indexed {args.csv_file}: {len(rebuild_index(args.csv_file, game))} draws")
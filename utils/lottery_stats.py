@@ -1,43 +1,48 @@
 import numpy as np
 import pandas as pd
 from collections import defaultdict
+from utils.incidence import incidence_matrix, frequencies, hit_gaps
+from utils.draw_index import window_frame
+from utils.window_counts import cumulative_counts, rolling_frequency
+from utils.memo import memoize
+from utils.game import HIT5
 
-def calculate_gaps(df, number_columns, window=None):
+@memoize
+def calculate_gaps(df, number_columns, window=None, as_of=None, game=HIT5):
     """
     Returns a dict: number -> list of gaps (number of draws between appearances)
     If window is set, restricts analysis to window most recent draws.
+    If as_of is set, only draws on or before that date are used.
     """
-    if window is not None:
-        df = df.tail(window)
-    all_numbers = range(1, 43)
-    gaps = {}
-    for n in all_numbers:
-        indices = np.where(df[number_columns].apply(lambda row: n in row.values, axis=1))[0]
-        if len(indices) == 0:
-            gaps[n] = []
-            continue
-        gap_list = [indices[0]]
-        for i in range(1, len(indices)):
-            gap_list.append(indices[i] - indices[i-1])
-        gaps[n] = gap_list
-    return gaps
+    df = window_frame(df, window, as_of)
+    X = incidence_matrix(df, number_columns, game.max_number)
+    return {n: g.tolist() for n, g in enumerate(hit_gaps(X), start=1)}
 
-def number_frequency(df, number_columns, window=None):
+@memoize
+def number_frequency(df, number_columns, window=None, as_of=None, game=HIT5):
     """
-    Returns dict: number -> number of times appeared in all/window draws.
+    Returns dict: number -> number of times appeared in all/window draws
+    (on or before as_of, if set).
     """
-    if window is not None:
-        df = df.tail(window)
-    all_numbers = range(1, 43)
-    freq = {n: df[number_columns].apply(lambda row: n in row.values, axis=1).sum() for n in all_numbers}
-    return freq
+    df = window_frame(df, window, as_of)
+    counts = frequencies(incidence_matrix(df, number_columns, game.max_number))
+    return {n: int(c) for n, c in enumerate(counts, start=1)}
 
-def get_hot_warm_cold(df, number_columns, std_mult=1):
+def rolling_number_frequency(df, number_columns, window=30, game=HIT5):
+    """
+    Returns a DataFrame (one row per draw, one column per game number) with each
+    number's hit count over the last `window` draws up to and including that row.
+    """
+    counts = rolling_frequency(cumulative_counts(incidence_matrix(df, number_columns, game.max_number)), window)
+    return pd.DataFrame(counts, index=df.index, columns=game.numbers)
+
+@memoize
+def get_hot_warm_cold(df, number_columns, std_mult=1, game=HIT5):
     """
     Classifies numbers as hot, warm, or cold by mean gap statistics.
     Returns (hot, warm, cold) lists.
     """
-    gaps = calculate_gaps(df, number_columns)
+    gaps = calculate_gaps(df, number_columns, game=game)
     mean_gaps = {n: np.mean(g) if len(g) else np.nan for n, g in gaps.items()}
     mean_gap_series = pd.Series(mean_gaps)
     avg = mean_gap_series.mean()
@@ -45,7 +50,7 @@ def get_hot_warm_cold(df, number_columns, std_mult=1):
     # Hot: much smaller than average gap, Cold: much larger
     hot = [n for n, m in mean_gaps.items() if not np.isnan(m) and m < avg - std_mult * std]
     cold = [n for n, m in mean_gaps.items() if not np.isnan(m) and m > avg + std_mult * std]
-    warm = [n for n in range(1, 43) if n not in hot and n not in cold]
+    warm = [n for n in game.numbers if n not in hot and n not in cold]
     return hot, warm, cold
 
 def longest_gap_per_number(gaps):
@@ -56,7 +61,7 @@ def longest_gap_per_number(gaps):
 
 def recent_hits(df, number_columns, n=2):
     """Return a set of numbers that appeared in the last n draws."""
-    return set(df[number_columns].tail(n).values.flatten())
+    return set(window_frame(df, n)[number_columns].values.flatten())
 
 def draws_set(df, number_columns):
     """
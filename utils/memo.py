@@ -0,0 +1,131 @@
+# utils/memo.py
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(df, columns=None):
+    """
+    Content hash of a draw DataFrame (the given columns, plus Date if present),
+    including row order. Equal data gives equal fingerprints, whatever object
+    it lives in.
+    """
+    cols = list(columns) if columns is not None else list(df.columns)
+    if 'Date' in df.columns and 'Date' not in cols:
+        cols = ['Date'] + cols
+    h = hashlib.blake2b(repr(cols).encode(), digest_size=16)
+    for col in cols:
+        values = df[col].to_numpy()
+        if values.dtype.kind in 'biufM':
+            # Numeric/datetime columns hash their raw bytes directly
+            h.update(values.dtype.str.encode())
+            h.update(np.ascontiguousarray(values).tobytes())
+        else:
+            h.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class StatsCache:
+    """
+    Bounded LRU cache for stats results with an optional on-disk (pickle) tier.
+    Cached values are shared, so callers must treat them as read-only.
+    """
+
+    def __init__(self, maxsize=256, disk_dir=None):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self._items = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest() + '.pkl')
+
+    def get(self, key):
+        """Returns (found, value)."""
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.stats["hits"] += 1
+            return True, self._items[key]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self.stats["disk_hits"] += 1
+                self._remember(key, value)
+                return True, value
+        self.stats["misses"] += 1
+        return False, None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+
+    def _remember(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def invalidate(self):
+        """Drops every cached result, in memory and on disk."""
+        self._items.clear()
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+
+_cache = StatsCache()
+
+
+def configure(maxsize=None, disk_dir=None):
+    """Resizes the shared cache and/or turns on the on-disk tier."""
+    if maxsize is not None:
+        _cache.maxsize = maxsize
+    if disk_dir is not None:
+        _cache.disk_dir = disk_dir
+
+
+def invalidate():
+    """Clears the shared stats cache (call when new draws are ingested)."""
+    _cache.invalidate()
+
+
+def cache_stats():
+    """Returns hit/miss counters and the number of results held in memory."""
+    return dict(_cache.stats, size=len(_cache._items))
+
+
+def memoize(func):
+    """
+    Caches func(df, number_columns, ...) on the fingerprint of the draw data
+    plus the remaining arguments (window, std_mult, ...).
+    """
+    sig = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(df, number_columns, *args, **kwargs):
+        bound = sig.bind(df, number_columns, *args, **kwargs)
+        bound.apply_defaults()
+        params = [(k, v) for k, v in bound.arguments.items() if k != 'df']
+        key = f"{func.__module__}.{func.__qualname__}:{fingerprint(df, number_columns)}:{params!r}"
+        found, value = _cache.get(key)
+        if not found:
+            value = func(df, number_columns, *args, **kwargs)
+            _cache.put(key, value)
+        return value
+
+    return wrapper
@@ -0,0 +1,83 @@
+# utils/online_stats.py
+import numpy as np
+import pandas as pd
+from utils.game import HIT5
+
+MAX_NUMBER = HIT5.max_number
+
+
+class DrawStatsState:
+    """
+    Running per-number statistics over a draw history, updated one draw at a time.
+    Gaps follow lottery_stats.calculate_gaps: a number's first gap is the index
+    of its first hit, later gaps are the distance between consecutive hits.
+    push() touches only the numbers in the draw, so walking a history of N
+    draws costs O(N) updates instead of recomputing every prefix.
+    """
+
+    def __init__(self, max_number=MAX_NUMBER):
+        self.max_number = max_number
+        self.n_draws = 0
+        self.counts = np.zeros(max_number, dtype=np.int64)
+        self.last_seen = np.full(max_number, -1, dtype=np.int64)
+        self.last_gap = np.zeros(max_number, dtype=np.int64)
+        self.gap_sum = np.zeros(max_number, dtype=np.int64)
+        self.gap_sumsq = np.zeros(max_number, dtype=np.int64)
+        self.longest_gap = np.zeros(max_number, dtype=np.int64)
+
+    @classmethod
+    def from_draws(cls, draws, max_number=MAX_NUMBER):
+        """Builds a state by pushing each row of an (N, 5) array of draws."""
+        state = cls(max_number)
+        for draw in draws:
+            state.push(draw)
+        return state
+
+    def push(self, draw):
+        """Adds one draw (an iterable of ball numbers) to the state."""
+        idx = np.unique(np.asarray(draw, dtype=np.int64)) - 1
+        idx = idx[(idx >= 0) & (idx < self.max_number)]
+        i = self.n_draws
+        last = self.last_seen[idx]
+        gap = np.where(last >= 0, i - last, i)
+        self.counts[idx] += 1
+        self.gap_sum[idx] += gap
+        self.gap_sumsq[idx] += gap * gap
+        self.longest_gap[idx] = np.maximum(self.longest_gap[idx], gap)
+        self.last_gap[idx] = gap
+        self.last_seen[idx] = i
+        self.n_draws += 1
+
+    def mean_gaps(self):
+        """Mean gap per number (NaN for numbers never drawn)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts > 0, self.gap_sum / self.counts, np.nan)
+
+    def gap_std(self):
+        """Population standard deviation of each number's gaps (NaN if never drawn)."""
+        mean = self.mean_gaps()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = np.where(self.counts > 0, self.gap_sumsq / self.counts, np.nan) - mean ** 2
+        return np.sqrt(np.maximum(var, 0))
+
+    def frequency(self):
+        """Dict: number -> hit count, as number_frequency returns."""
+        return {n: int(c) for n, c in enumerate(self.counts, start=1)}
+
+    def current_gaps(self):
+        """Dict: number -> most recent gap (0 if never drawn), as used by select_pool."""
+        return {n: int(g) for n, g in enumerate(self.last_gap, start=1)}
+
+    def hot_warm_cold(self, std_mult=1):
+        """
+        Snapshot of get_hot_warm_cold for the draws pushed so far.
+        Returns (hot, warm, cold) lists.
+        """
+        mean_gaps = dict(zip(range(1, self.max_number + 1), self.mean_gaps()))
+        mean_gap_series = pd.Series(mean_gaps)
+        avg = mean_gap_series.mean()
+        std = mean_gap_series.std()
+        hot = [n for n, m in mean_gaps.items() if not np.isnan(m) and m < avg - std_mult * std]
+        cold = [n for n, m in mean_gaps.items() if not np.isnan(m) and m > avg + std_mult * std]
+        warm = [n for n in range(1, self.max_number + 1) if n not in hot and n not in cold]
+        return hot, warm, cold
@@ -1,14 +1,23 @@
 # utils/pool_select.py
 from utils.lottery_stats import calculate_gaps, get_hot_warm_cold
+from utils.game import HIT5
 import pandas as pd
 import numpy as np
 
 # Main pool-selection function
 
-def select_pool(df, number_columns, gap_n_cold=5):
-    hot, warm, cold = get_hot_warm_cold(df, number_columns)
-    all_gaps = calculate_gaps(df, number_columns)
+def select_pool(df, number_columns, gap_n_cold=5, game=HIT5):
+    hot, warm, cold = get_hot_warm_cold(df, number_columns, game=game)
+    all_gaps = calculate_gaps(df, number_columns, game=game)
     current_gaps = {n: g[-1] if g else 0 for n, g in all_gaps.items()}
+    return _pool_from_gaps(hot, warm, current_gaps, gap_n_cold)
+
+def select_pool_from_state(state, gap_n_cold=5):
+    """Same pool as select_pool, read from a DrawStatsState instead of a DataFrame."""
+    hot, warm, cold = state.hot_warm_cold()
+    return _pool_from_gaps(hot, warm, state.current_gaps(), gap_n_cold)
+
+def _pool_from_gaps(hot, warm, current_gaps, gap_n_cold):
     # Excessively cold: top N by current gap
     excessively_cold = sorted(current_gaps, key=lambda n: current_gaps[n], reverse=True)[:gap_n_cold]
     # Warm with above-median current gap
@@ -20,23 +29,18 @@ def select_pool(df, number_columns, gap_n_cold=5):
     pool = set(hot) | set(excessively_cold) | set(qualified_warm)
     return pool
 
-def select_gap_pool(df, number_columns, N_hot=1, N_warm=3, N_cold=1):
-    all_numbers = range(1, 43)
-    gap_list = {}
-    for num in all_numbers:
-        gaps = []
-        indices = df[number_columns].apply(lambda row: num in row.values, axis=1)
-        hit_indices = list(np.where(indices)[0])
-        if not hit_indices:
-            continue
-        for i in range(len(hit_indices)):
-            if i == 0:
-                gaps.append(hit_indices[i])
-            else:
-                gaps.append(hit_indices[i] - hit_indices[i-1])
-        gap_list[num] = gaps
-
+def select_gap_pool(df, number_columns, N_hot=1, N_warm=3, N_cold=1, game=HIT5):
+    # Numbers that never hit are left out of the classification
+    gap_list = {num: gaps for num, gaps in calculate_gaps(df, number_columns, game=game).items() if gaps}
     mean_gaps = {num: np.mean(gaps) for num, gaps in gap_list.items()}
+    return _gap_pool_from_means(mean_gaps, N_hot, N_warm, N_cold)
+
+def select_gap_pool_from_state(state, N_hot=1, N_warm=3, N_cold=1):
+    """Same pool as select_gap_pool, read from a DrawStatsState instead of a DataFrame."""
+    mean_gaps = {n: m for n, m in enumerate(state.mean_gaps(), start=1) if state.counts[n - 1]}
+    return _gap_pool_from_means(mean_gaps, N_hot, N_warm, N_cold)
+
+def _gap_pool_from_means(mean_gaps, N_hot, N_warm, N_cold):
     mean_gap_series = pd.Series(mean_gaps)
     avg_gap = mean_gap_series.mean()
     std_gap = mean_gap_series.std()
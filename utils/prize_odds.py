@@ -0,0 +1,187 @@
+# utils/prize_odds.py
+import math
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from utils.combinadic import rank, unrank
+from utils.game import HIT5
+
+TICKET_PRICE = 1
+# Hit 5 prize levels as listed on the results pages. 5 of 5 is the jackpot,
+# which starts at $100,000 and grows until won; 2 of 5 pays a free $1 ticket.
+PRIZES = {5: 100_000, 4: 150, 3: 15, 2: TICKET_PRICE}
+CHUNK_SIZE = 1 << 16
+
+
+def match_counts(game=HIT5):
+    """
+    Hypergeometric table for one ticket: entry k is the number of possible
+    draws sharing exactly k numbers with it, C(p, k) * C(N - p, p - k).
+    The entries sum to game.total_combos.
+    """
+    n, p = game.max_number, game.picks
+    return np.array([math.comb(p, k) * math.comb(n - p, p - k) for k in range(p + 1)], dtype=np.int64)
+
+
+def _prize_vector(prizes, game):
+    values = np.zeros(game.picks + 1)
+    for k, prize in prizes.items():
+        values[k] = prize
+    return values
+
+
+def odds_table(prizes=PRIZES, game=HIT5):
+    """
+    Exact prize-tier odds for a single ticket (every ticket has the same
+    odds). Columns: matches, draws, probability, odds (1 in ...), prize and
+    expected (probability x prize).
+    """
+    counts = match_counts(game)
+    prob = counts / game.total_combos
+    prize = _prize_vector(prizes, game)
+    return pd.DataFrame({
+        "matches": np.arange(game.picks + 1),
+        "draws": counts,
+        "probability": prob,
+        "odds": game.total_combos / counts,
+        "prize": prize,
+        "expected": prob * prize,
+    })
+
+
+def expected_value(prizes=PRIZES, game=HIT5, price=TICKET_PRICE):
+    """Expected net return of one ticket: expected prize minus the ticket price."""
+    return float(odds_table(prizes, game)["expected"].sum()) - price
+
+
+def _ticket_array(tickets, game):
+    t = np.asarray(tickets, dtype=np.int64).reshape(-1, game.picks)
+    rank(t, game.max_number)  # validates numbers and repeats
+    return np.sort(t, axis=1)
+
+
+def _popcount_counts(tickets, draws, game):
+    """n_k for each draw row by AND + popcount against every ticket mask."""
+    bit = lambda c: np.bitwise_or.reduce(np.uint64(1) << (c.astype(np.uint64) - np.uint64(1)), axis=1)
+    ticket_masks, draw_masks = bit(tickets), bit(draws)
+    out = np.zeros((len(draws), game.picks + 1), dtype=np.int64)
+    # About 16M draw x ticket pairs per block
+    rows = max(1, (1 << 24) // max(1, len(ticket_masks)))
+    for start in range(0, len(draws), rows):
+        m = np.bitwise_count(draw_masks[start:start + rows, None] & ticket_masks[None, :])
+        at_least = [(m >= k).sum(axis=1, dtype=np.int64) for k in range(1, game.picks + 1)]
+        at_least = np.column_stack([np.full(len(m), len(ticket_masks))] + at_least + [np.zeros(len(m), np.int64)])
+        out[start:start + len(m)] = at_least[:, :-1] - at_least[:, 1:]
+    return out
+
+
+def _subset_tables(tickets, game):
+    """For j = 0..picks, how many tickets contain each j-subset (indexed by combinadic rank)."""
+    tables = [np.array([len(tickets)])]
+    for j in range(1, game.picks + 1):
+        ranks = [rank(tickets[:, list(cols)], game.max_number) for cols in combinations(range(game.picks), j)]
+        tables.append(np.bincount(np.concatenate(ranks), minlength=math.comb(game.max_number, j)))
+    return tables
+
+
+def _subset_counts(tables, draws, game):
+    """
+    n_k for each draw row from subset tables: c_j = sum over the draw's
+    j-subsets of tickets containing them = sum_k C(k, j) n_k, inverted as
+    n_k = sum_{j >= k} (-1)^(j - k) C(j, k) c_j.
+    """
+    p = game.picks
+    c = np.empty((len(draws), p + 1), dtype=np.int64)
+    c[:, 0] = tables[0][0]
+    for j in range(1, p + 1):
+        c[:, j] = sum(tables[j][rank(draws[:, list(cols)], game.max_number)] for cols in combinations(range(p), j))
+    inverse = np.array([[(-1) ** (j - k) * math.comb(j, k) for k in range(p + 1)] for j in range(p + 1)], dtype=np.int64)
+    return c @ inverse
+
+
+def draw_match_counts(tickets, game=HIT5, method="subsets", chunk_size=CHUNK_SIZE):
+    """
+    Enumerates every possible draw (combinadic rank order) against a ticket
+    set. Returns a (total_combos, picks + 1) array: row d, column k is how
+    many tickets match exactly k numbers of draw d.
+    method="popcount" compares each draw with every ticket by bitmask AND +
+    popcount (time grows with draws x tickets; games up to 64 numbers).
+    method="subsets" counts tickets per sub-combo once and looks each draw's
+    sub-combos up, so time barely depends on the number of tickets.
+    Both are exact.
+    """
+    tickets = _ticket_array(tickets, game)
+    if method == "popcount":
+        game.check_bitmask()
+        count = lambda draws: _popcount_counts(tickets, draws, game)
+    elif method == "subsets":
+        tables = _subset_tables(tickets, game)
+        count = lambda draws: _subset_counts(tables, draws, game)
+    else:
+        raise ValueError(f"unknown method {method!r}")
+    total = game.total_combos
+    out = np.empty((total, game.picks + 1), dtype=np.int64)
+    for start in range(0, total, chunk_size):
+        draws = unrank(np.arange(start, min(start + chunk_size, total)), game.picks, game.max_number).astype(np.int64)
+        out[start:start + len(draws)] = count(draws)
+    return out
+
+
+def _distribution(values, total, name):
+    values, counts = np.unique(values, return_counts=True)
+    return pd.DataFrame({name: values, "draws": counts, "probability": counts / total})
+
+
+def ticket_set_odds(tickets, prizes=PRIZES, game=HIT5, price=TICKET_PRICE, method="subsets"):
+    """
+    Exact outcome distribution of playing a whole ticket set on one draw.
+    Returns a dict:
+      tickets, cost            - number of tickets and their price
+      per_ticket               - odds_table() (the same for every ticket)
+      best_match               - distribution of the best match across the set
+      tier_hits                - P(at least one ticket matches exactly k)
+      payout                   - distribution of the total payout
+      expected_payout, expected_net, p_any_prize
+    """
+    counts = draw_match_counts(tickets, game, method)
+    total = len(counts)
+    n_tickets = int(counts[0].sum()) if total else 0
+    best = (game.picks - np.argmax(counts[:, ::-1] > 0, axis=1)) if n_tickets else np.zeros(total, np.int64)
+    payout = counts @ _prize_vector(prizes, game)
+    hits = (counts > 0).sum(axis=0)
+    expected_payout = float(payout.mean())
+    return {
+        "tickets": n_tickets,
+        "cost": n_tickets * price,
+        "per_ticket": odds_table(prizes, game),
+        "best_match": _distribution(best, total, "matches"),
+        "tier_hits": pd.DataFrame({"matches": np.arange(game.picks + 1), "draws": hits, "probability": hits / total}),
+        "payout": _distribution(payout, total, "payout"),
+        "expected_payout": expected_payout,
+        "expected_net": expected_payout - n_tickets * price,
+        "p_any_prize": float((payout > 0).mean()),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from utils.combo_store import read_text_combos
+    parser = argparse.ArgumentParser(description="Exact prize odds and expected value of a ticket set.")
+    parser.add_argument("tickets", nargs="?", help=".csv/.txt combo output (default: single-ticket odds only)")
+    parser.add_argument("--jackpot", type=float, default=PRIZES[5])
+    parser.add_argument("--top", type=int, help="Only the first N tickets of the file")
+    parser.add_argument("--method", choices=["subsets", "popcount"], default="subsets")
+    args = parser.parse_args()
+
+    prizes = {**PRIZES, 5: args.jackpot}
+    with pd.option_context("display.width", 120, "display.float_format", "{:.6g}".format):
+        print(odds_table(prizes).to_string(index=False))
+        print(f"Expected net per ${TICKET_PRICE} ticket: {expected_value(prizes):.4f}\n")
+        if args.tickets:
+            combos, _ = read_text_combos(args.tickets)
+            combos = combos[:args.top]
+            result = ticket_set_odds(combos, prizes, method=args.method)
+            print(f"{result['tickets']} tickets, cost ${result['cost']:,}")
+            print(result["best_match"].to_string(index=False))
+            print(f"P(any prize): {result['p_any_prize']:.6f}")
+            print(f"Expected payout: ${result['expected_payout']:,.2f}, expected net: ${result['expected_net']:,.2f}")
@@ -0,0 +1,129 @@
+# utils/randomness.py
+import numpy as np
+import pandas as pd
+
+
+def frequency_chi_square(X):
+    """
+    Chi-square goodness-of-fit of number frequencies against the uniform
+    expectation (every number equally likely). X is an N x K incidence matrix.
+    Returns (statistic, dof, p_value).
+    """
+    from scipy.stats import chi2
+    observed = np.asarray(X).sum(axis=0).astype(float)
+    expected = observed.sum() / len(observed)
+    stat = ((observed - expected) ** 2 / expected).sum()
+    dof = len(observed) - 1
+    return stat, dof, chi2.sf(stat, dof)
+
+
+def runs_test(S, correction=True):
+    """
+    Wald-Wolfowitz runs test on every column of an N x M 0/1 matrix at once
+    (same statistic as statsmodels' runstest_1samp, including the 0.5
+    continuity correction below 50 observations). Returns (z, p_value) arrays.
+    Columns that are all 0 or all 1 give NaN.
+    """
+    from scipy.stats import norm
+    S = np.asarray(S, dtype=bool)
+    n = S.shape[0]
+    runs = 1 + (S[1:] != S[:-1]).sum(axis=0)
+    n_pos = S.sum(axis=0).astype(float)
+    npn = n_pos * (n - n_pos)
+    mean = 2.0 * npn / n + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt(2.0 * npn * (2.0 * npn - n) / n ** 2 / (n - 1.0))
+        diff = runs - mean
+        if correction and n < 50:
+            diff = np.where(diff > 0.5, diff - 0.5, np.where(diff < 0.5, diff + 0.5, 0.0))
+        z = np.where(npn > 0, diff / std, np.nan)
+    return z, 2 * norm.sf(np.abs(z))
+
+
+def autocorrelation(S, max_lag):
+    """
+    Sample autocorrelation r_1..r_max_lag of every column of an N x M matrix,
+    computed with one FFT per column. Returns a max_lag x M array (NaN for
+    constant columns).
+    """
+    S = np.asarray(S, dtype=float)
+    n = S.shape[0]
+    centered = S - S.mean(axis=0)
+    nfft = 1 << int(2 * n - 1).bit_length()
+    F = np.fft.rfft(centered, n=nfft, axis=0)
+    acov = np.fft.irfft(F * np.conj(F), n=nfft, axis=0)[:max_lag + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return acov[1:] / acov[0]
+
+
+def adjust_pvalues(p, method='bh'):
+    """
+    Multiple-testing correction. method='bh' gives Benjamini-Hochberg
+    (false discovery rate) adjusted p-values, 'bonferroni' the Bonferroni ones.
+    NaN p-values are left out of the count and stay NaN.
+    """
+    p = np.asarray(p, dtype=float)
+    out = np.full(p.shape, np.nan)
+    ok = ~np.isnan(p)
+    m = ok.sum()
+    if not m:
+        return out
+    if method == 'bonferroni':
+        out[ok] = np.minimum(p[ok] * m, 1.0)
+    elif method == 'bh':
+        vals = p[ok]
+        order = np.argsort(vals)
+        scaled = vals[order] * m / np.arange(1, m + 1)
+        adjusted = np.empty(m)
+        adjusted[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+        out[ok] = adjusted
+    else:
+        raise ValueError(f"unknown method: {method}")
+    return out
+
+
+def randomness_tests(X, positions=None, max_lag=20, method='bh', alpha=0.05):
+    """
+    Runs the whole randomness battery in one call and returns a tidy DataFrame
+    (test, series, lag, statistic, p_value, p_adjusted, significant):
+      - chi-square on number frequencies
+      - runs test on each number's hit/miss series (one per column of X)
+      - autocorrelation at lags 1..max_lag of each hit/miss series
+    If positions (N x 5 ball values, e.g. df[NUMBER_COLUMNS]) is given, each
+    position column gets a runs test (above/below its median) and the same
+    autocorrelations. Rows must be in draw order, oldest first.
+    p_adjusted is corrected over every row of the table.
+    """
+    from scipy.stats import norm
+    X = np.asarray(X, dtype=bool)
+    n, k = X.shape
+    series = [str(i) for i in range(1, k + 1)]
+    runs_input = X
+    acf_input = X
+    if positions is not None:
+        if isinstance(positions, pd.DataFrame):
+            series += list(positions.columns)
+        else:
+            series += [f"Num{i}" for i in range(1, np.shape(positions)[1] + 1)]
+        P = np.asarray(positions, dtype=float)
+        runs_input = np.hstack([X, P > np.median(P, axis=0)])
+        acf_input = np.hstack([X, P])
+    series = np.array(series, dtype=object)
+
+    stat, dof, p = frequency_chi_square(X)
+    frames = [pd.DataFrame({"test": "chi_square", "series": "all", "lag": 0,
+                            "statistic": [stat], "p_value": [p]})]
+    z, p = runs_test(runs_input)
+    frames.append(pd.DataFrame({"test": "runs", "series": series, "lag": 0,
+                                "statistic": z, "p_value": p}))
+    r = autocorrelation(acf_input, max_lag)
+    # White-noise null: r_k is approximately N(0, 1/n)
+    lags = np.repeat(np.arange(1, max_lag + 1), len(series))
+    frames.append(pd.DataFrame({"test": "autocorrelation", "series": np.tile(series, max_lag),
+                                "lag": lags, "statistic": r.ravel(),
+                                "p_value": 2 * norm.sf(np.abs(r.ravel()) * np.sqrt(n))}))
+
+    table = pd.concat(frames, ignore_index=True)
+    table["p_adjusted"] = adjust_pvalues(table["p_value"].to_numpy(), method)
+    table["significant"] = table["p_adjusted"] < alpha
+    return table
@@ -0,0 +1,186 @@
+# utils/simulate.py
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.incidence import frequencies, last_seen, longest_gaps
+from utils.randomness import frequency_chi_square, runs_test
+from utils.game import HIT5
+
+MAX_NUMBER = HIT5.max_number
+PICKS = HIT5.picks
+CHUNK_SIZE = 50
+
+# name -> function(X) -> float, where X is an N x max_number incidence matrix
+STATISTICS = {}
+
+
+def register(name):
+    """Decorator that adds a statistic to the simulator's registry."""
+    def wrap(func):
+        STATISTICS[name] = func
+        return func
+    return wrap
+
+
+@register("max_gap")
+def max_gap(X):
+    """Longest gap of any number (lottery_stats.longest_gap_per_number, maximized)."""
+    return float(longest_gaps(X).max())
+
+
+@register("max_current_gap")
+def max_current_gap(X):
+    """Draws since the most overdue number last hit."""
+    return float((len(X) - 1 - last_seen(X)).max())
+
+
+def _mean_gaps(X):
+    counts = frequencies(X)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, last_seen(X) / counts, np.nan)
+
+
+@register("hot_count")
+def hot_count(X, std_mult=1):
+    """How many numbers get_hot_warm_cold would call hot."""
+    m = _mean_gaps(X)
+    return float((m < np.nanmean(m) - std_mult * np.nanstd(m, ddof=1)).sum())
+
+
+@register("cold_count")
+def cold_count(X, std_mult=1):
+    """How many numbers get_hot_warm_cold would call cold."""
+    m = _mean_gaps(X)
+    return float((m > np.nanmean(m) + std_mult * np.nanstd(m, ddof=1)).sum())
+
+
+@register("chi_square")
+def chi_square(X):
+    """Frequency chi-square statistic against a uniform draw."""
+    return float(frequency_chi_square(X)[0])
+
+
+@register("runs_z")
+def runs_z(X):
+    """Runs test z of all drawn numbers above/below the median, as in analysis.py."""
+    numbers = np.nonzero(X)[1] + 1
+    z, p = runs_test((numbers > np.median(numbers))[:, None])
+    return float(z[0])
+
+
+@register("sum_slope")
+def sum_slope(X):
+    """Least-squares slope of draw sums over draw index (the sum trend in analysis.py)."""
+    sums = X @ np.arange(1, X.shape[1] + 1)
+    x = np.arange(len(sums)) - (len(sums) - 1) / 2
+    return float((x * (sums - sums.mean())).sum() / (x * x).sum())
+
+
+def simulate_draws(rng, n_draws, max_number=MAX_NUMBER, picks=PICKS):
+    """
+    Returns an (n_draws, picks) array of uniform picks-of-max_number draws,
+    each row sorted, by taking the picks smallest keys of a random matrix.
+    """
+    keys = rng.random((n_draws, max_number), dtype=np.float32)
+    draws = np.argpartition(keys, picks - 1, axis=1)[:, :picks]
+    draws.sort(axis=1)
+    return (draws + 1).astype(np.uint8)
+
+
+def simulate_incidence(rng, n_draws, max_number=MAX_NUMBER, picks=PICKS):
+    """Same as simulate_draws, as an N x max_number incidence matrix."""
+    keys = rng.random((n_draws, max_number), dtype=np.float32)
+    X = np.zeros((n_draws, max_number), dtype=bool)
+    np.put_along_axis(X, np.argpartition(keys, picks - 1, axis=1)[:, :picks], True, axis=1)
+    return X
+
+
+def _simulate_chunk(seed, n_sims, n_draws, names, max_number, picks):
+    rng = np.random.default_rng(seed)
+    funcs = [STATISTICS[name] for name in names]
+    out = np.empty((n_sims, len(names)))
+    for s in range(n_sims):
+        X = simulate_incidence(rng, n_draws, max_number, picks)
+        out[s] = [f(X) for f in funcs]
+    return out
+
+
+def null_distribution(n_draws, statistics=None, n_sims=1000, seed=0, workers=None,
+                      chunk_size=CHUNK_SIZE, max_number=MAX_NUMBER, picks=PICKS):
+    """
+    Simulates n_sims histories of n_draws uniform draws and returns a DataFrame
+    with one row per history and one column per statistic.
+    Simulations are split into fixed chunks, each with its own child of
+    SeedSequence(seed), so the result is the same for any number of workers.
+    Custom statistics must be registered at module level to reach worker processes.
+    """
+    names = list(statistics or STATISTICS)
+    n_chunks = math.ceil(n_sims / chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [min(chunk_size, n_sims - c * chunk_size) for c in range(n_chunks)]
+    args = [(seeds[c], sizes[c], n_draws, names, max_number, picks) for c in range(n_chunks)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n_chunks == 1:
+        results = [_simulate_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, n_chunks)) as pool:
+            results = list(pool.map(_simulate_chunk, *zip(*args)))
+    return pd.DataFrame(np.vstack(results), columns=names)
+
+
+def empirical_pvalues(observed, null, alternative="two-sided"):
+    """
+    Empirical p-values of observed statistics (dict name -> value) against a
+    null_distribution table. Uses (1 + #as-extreme) / (1 + n_sims), so p is
+    never exactly 0. alternative is 'greater', 'less' or 'two-sided'.
+    """
+    pvalues = {}
+    n = len(null)
+    for name, value in observed.items():
+        sims = null[name].to_numpy()
+        greater = (1 + (sims >= value).sum()) / (n + 1)
+        less = (1 + (sims <= value).sum()) / (n + 1)
+        if alternative == "greater":
+            pvalues[name] = greater
+        elif alternative == "less":
+            pvalues[name] = less
+        else:
+            pvalues[name] = min(1.0, 2 * min(greater, less))
+    return pvalues
+
+
+def simulation_test(X, statistics=None, n_sims=1000, seed=0, workers=None, alternative="two-sided"):
+    """
+    Computes each statistic on the real history X and compares it with its
+    simulated null distribution. Returns a DataFrame:
+    statistic, observed, null_mean, null_std, p_value.
+    """
+    X = np.asarray(X, dtype=bool)
+    names = list(statistics or STATISTICS)
+    picks = int(X.sum(axis=1).max())
+    null = null_distribution(len(X), names, n_sims, seed, workers, max_number=X.shape[1], picks=picks)
+    observed = {name: STATISTICS[name](X) for name in names}
+    pvalues = empirical_pvalues(observed, null, alternative)
+    return pd.DataFrame({
+        "statistic": names,
+        "observed": [observed[n] for n in names],
+        "null_mean": null[names].mean().to_numpy(),
+        "null_std": null[names].std().to_numpy(),
+        "p_value": [pvalues[n] for n in names],
+    })
+
+
+if __name__ == "__main__":
+    import argparse
+    from utils.draw_store import DEFAULT_PATH, NUMBER_COLUMNS, load_draws
+    from utils.incidence import incidence_matrix
+    parser = argparse.ArgumentParser(description="Compare history statistics with simulated random draws.")
+    parser.add_argument("--data", default=DEFAULT_PATH)
+    parser.add_argument("--sims", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    X = incidence_matrix(load_draws(args.data), NUMBER_COLUMNS)
+    print(simulation_test(X, n_sims=args.sims, seed=args.seed, workers=args.workers).to_string(index=False))
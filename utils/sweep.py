@@ -0,0 +1,180 @@
+# utils/sweep.py
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from utils.online_stats import DrawStatsState
+from utils.pool_select import select_pool_from_state, select_gap_pool_from_state
+
+TEST_WINDOW = 100  # backtest_pool.py defaults
+WARMUP = 20
+
+# name -> function(state, **params) -> pool (set of numbers), where state is a
+# DrawStatsState holding the draws before the one being tested
+STRATEGIES = {}
+
+
+def register(name):
+    """Decorator that adds a pool strategy to the sweep's registry."""
+    def wrap(func):
+        STRATEGIES[name] = func
+        return func
+    return wrap
+
+
+@register("pool")
+def pool_strategy(state, gap_n_cold=5):
+    """backtest_pool_strategy: select_pool on the draws so far."""
+    return select_pool_from_state(state, gap_n_cold)
+
+
+@register("gap_pool")
+def gap_pool_strategy(state, n_hot=1, n_warm=3, n_cold=1):
+    """backtest_gap_pool: N hot + N warm + N cold by mean gap."""
+    return select_gap_pool_from_state(state, n_hot, n_warm, n_cold)
+
+
+@register("hybrid_pool")
+def hybrid_pool_strategy(state, gap_n_cold=15, pool_size=21):
+    """hybrid_backtest.py's candidate pool: select_pool, topped up with the least-drawn numbers, trimmed to pool_size."""
+    pool = list(select_pool_from_state(state, gap_n_cold))
+    if len(pool) < pool_size:
+        counts = [(n, state.counts[n - 1]) for n in range(1, state.max_number + 1) if n not in pool]
+        counts.sort(key=lambda t: t[1])
+        pool += [n for n, _ in counts[:pool_size - len(pool)]]
+    return set(pool[:pool_size])
+
+
+# Sweep over the constants backtest_pool.py and hybrid_backtest.py hard-code
+DEFAULT_GRID = [
+    {"strategy": ["pool"], "gap_n_cold": [3, 5, 7, 10, 15], "test_window": [100, 180]},
+    {"strategy": ["gap_pool"], "n_hot": [1, 2], "n_warm": [3, 5, 8], "n_cold": [1, 2], "test_window": [100, 180]},
+    {"strategy": ["hybrid_pool"], "gap_n_cold": [5, 10, 15], "pool_size": [15, 21, 25], "test_window": [100, 180]},
+]
+
+
+def expand_grid(grid):
+    """
+    Expands a parameter grid (dict: name -> list of values, or a list of such
+    dicts) into a list of config dicts, one per combination.
+    """
+    configs = []
+    for g in [grid] if isinstance(grid, dict) else grid:
+        names = list(g)
+        configs += [dict(zip(names, values)) for values in itertools.product(*(g[n] for n in names))]
+    return configs
+
+
+def run_config(X, config):
+    """
+    Walk-forward backtest of one config over the last test_window rows of the
+    N x K incidence matrix X (in date order), as in backtest_pool.py: the
+    state starts empty at the window, and each draw after the first `warmup`
+    is checked against the pool built from the draws before it.
+    Returns a dict: the config, draws tested, mean pool size, coverage (all
+    numbers in the pool), mean matches and matches_k counts.
+    """
+    params = dict(config)
+    strategy = STRATEGIES[params.pop("strategy")]
+    test_window = params.pop("test_window", TEST_WINDOW)
+    warmup = params.pop("warmup", WARMUP)
+    draws = X[-test_window:]
+    picks = int(draws[0].sum()) if len(draws) else 0
+    state = DrawStatsState(X.shape[1])
+    matches, sizes, covered = [], [], 0
+    for idx, row in enumerate(draws):
+        numbers = np.flatnonzero(row) + 1
+        if idx >= warmup:
+            pool = strategy(state, **params)
+            m = sum(int(n) in pool for n in numbers)
+            matches.append(m)
+            sizes.append(len(pool))
+            covered += m == len(numbers)
+        state.push(numbers)
+    tested = len(matches)
+    result = dict(config, draws_tested=tested,
+                  mean_pool_size=np.mean(sizes) if tested else np.nan,
+                  coverage=covered / tested if tested else np.nan,
+                  mean_matches=np.mean(matches) if tested else np.nan)
+    counts = np.bincount(matches, minlength=picks + 1)
+    result.update({f"matches_{k}": int(c) for k, c in enumerate(counts)})
+    return result
+
+
+# Worker-side view of the shared incidence matrix, set by _attach
+_SHARED = None
+
+
+def _attach(name, shape, dtype):
+    global _SHARED
+    shm = shared_memory.SharedMemory(name=name)
+    # Keep the SharedMemory object alive with the view; no copy is made
+    _SHARED = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def _run_shared(config):
+    return run_config(_SHARED[1], config)
+
+
+def sweep(X, grid, workers=None, chunksize=None):
+    """
+    Runs run_config for every config in the grid and returns one DataFrame row
+    per config (in grid order). With more than one worker the incidence matrix
+    is placed in shared memory once and every worker process maps it without
+    copying; configs are independent, so throughput grows with the core count.
+    """
+    configs = expand_grid(grid)
+    X = np.ascontiguousarray(X, dtype=bool)
+    workers = min(workers or os.cpu_count() or 1, len(configs))
+    if workers <= 1:
+        return _table([run_config(X, c) for c in configs], configs)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, X.nbytes))
+    try:
+        np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)[:] = X
+        chunksize = chunksize or max(1, len(configs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, X.shape, X.dtype.str)) as pool:
+            rows = list(pool.map(_run_shared, configs, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+    return _table(rows, configs)
+
+
+def _table(rows, configs):
+    # Parameter columns first (strategies take different ones), then the metrics
+    params = list(dict.fromkeys(name for c in configs for name in c))
+    df = pd.DataFrame(rows)
+    return df[params + [c for c in df.columns if c not in params]]
+
+
+def chronological_incidence(df, number_columns, max_number=None):
+    """Incidence matrix of df's draws in date order (the order DrawIndex.last walks)."""
+    from utils.draw_index import frame_index
+    from utils.incidence import MAX_NUMBER, incidence_matrix
+    rows = frame_index(df).chronological()
+    return incidence_matrix(df.iloc[rows], number_columns, max_number or MAX_NUMBER)
+
+
+if __name__ == "__main__":
+    import argparse
+    from utils.draw_store import NUMBER_COLUMNS, load_draws
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep of the pool backtests.")
+    parser.add_argument("--data", default='data/hit5_clean_deduped.csv')
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), help="Only sweep this strategy")
+    parser.add_argument("--out", help="Also write the results table to this CSV")
+    args = parser.parse_args()
+    X = chronological_incidence(load_draws(args.data), NUMBER_COLUMNS)
+    grid = [g for g in DEFAULT_GRID if args.strategy in (None, *g["strategy"])]
+    started = time.perf_counter()
+    results = sweep(X, grid, args.workers)
+    elapsed = time.perf_counter() - started
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.max_rows", None):
+        print(results.sort_values(["coverage", "mean_matches"], ascending=False).to_string(index=False))
+    print(f"{len(results)} configs in {elapsed:.2f}s ({len(results) / elapsed:.1f} configs/s)")
+    if args.out:
+        results.to_csv(args.out, index=False)
@@ -0,0 +1,71 @@
+# utils/topk.py
+import heapq
+from itertools import islice
+from utils.game import HIT5
+
+MAX_NUMBER = HIT5.max_number
+PICKS = HIT5.picks
+
+
+def _score_lookup(scores):
+    if hasattr(scores, "items"):
+        return {int(n): float(s) for n, s in scores.items()}
+    return {n: float(s) for n, s in enumerate(scores, start=1)}
+
+
+def best_first_combos(scores, groups=None, predicate=None, picks=PICKS):
+    """
+    Yields (combo, score) in descending order of score = sum(scores[n] for n in combo),
+    without enumerating the candidate space.
+    scores: dict/Series number -> score, or a sequence for numbers 1..len.
+    groups: list of (numbers, count) meaning "choose count numbers from each
+            group" (e.g. [(warm, 3), (hot, 1), (cold, 1)]); by default every
+            number with a score, choose picks.
+    predicate: optional function(combo) -> bool; combos failing it are skipped.
+    Combos are sorted tuples. Equal scores come out in the order nested
+    itertools.combinations loops over the groups would produce them.
+    """
+    score_of = _score_lookup(scores)
+    if groups is None:
+        groups = [(sorted(score_of), picks)]
+    # Each group's numbers ranked best-first; a state picks positions in that ranking
+    ranked = []
+    for numbers, count in groups:
+        numbers = list(numbers)
+        order = sorted(range(len(numbers)), key=lambda i: -score_of.get(numbers[i], 0))
+        ranked.append((numbers, order, count))
+    if any(count > len(numbers) for numbers, order, count in ranked):
+        return
+
+    def entry(state):
+        chosen = []
+        tie = []
+        for (numbers, order, count), positions in zip(ranked, state):
+            original = sorted(order[p] for p in positions)
+            tie.extend(original)
+            chosen.extend(numbers[i] for i in original)
+        combo = tuple(sorted(chosen))
+        return (-sum(score_of.get(n, 0) for n in combo), tuple(tie), state, combo)
+
+    start = tuple(tuple(range(count)) for numbers, order, count in ranked)
+    frontier = [entry(start)]
+    seen = {start}
+    while frontier:
+        neg_score, tie, state, combo = heapq.heappop(frontier)
+        if len(set(combo)) == len(combo) and (predicate is None or predicate(combo)):
+            yield combo, -neg_score
+        # Successors move one chosen position one step down its group's ranking
+        for g, ((numbers, order, count), positions) in enumerate(zip(ranked, state)):
+            for j in range(count):
+                limit = positions[j + 1] if j + 1 < count else len(numbers)
+                if positions[j] + 1 < limit:
+                    moved = positions[:j] + (positions[j] + 1,) + positions[j + 1:]
+                    nxt = state[:g] + (moved,) + state[g + 1:]
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        heapq.heappush(frontier, entry(nxt))
+
+
+def top_k_combos(scores, k, groups=None, predicate=None, picks=PICKS):
+    """Returns the k best (combo, score) pairs from best_first_combos."""
+    return list(islice(best_first_combos(scores, groups, predicate, picks), k))
@@ -1,9 +1,13 @@
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import pandas as pd
 from matplotlib.patches import Patch
-plt.style.use('seaborn-v0_8-darkgrid')
+
+STYLE = 'seaborn-v0_8-darkgrid'
+
+def set_style(style=STYLE):
+    """Applies the project plot style (call once before plotting; not done on import)."""
+    plt.style.use(style)
 
 # Frequency plot with number annotations
 def plot_number_frequency(freq_dict, title="Number Frequency", xlabel="Number", ylabel="Draws"):
@@ -70,6 +74,7 @@ def plot_residuals_heatmap(freq_dict, n_numbers, n_draws, expected_per_number, t
     observed = np.array([freq_dict.get(i, 0) for i in numbers])
     expected = np.full_like(observed, expected_per_number)
     residuals = (observed - expected) / np.sqrt(expected)
+    import seaborn as sns  # only this plot needs seaborn
     plt.figure(figsize=(14, 5))
     sns.heatmap([residuals], annot=True, fmt=".1f", cmap="coolwarm", cbar=True, xticklabels=numbers, yticklabels=[""])
     plt.title(title)
@@ -0,0 +1,52 @@
+# utils/walk_features.py
+import numpy as np
+from utils.window_counts import cumulative_counts
+
+WINDOW = 20
+# Mean-gap thresholds of the hot/warm/cold code used by the ML backtests
+AVG_GAP, STD_GAP = 8.26, 1.76
+FEATURES = ["freq", "gap", "window_freq", "mean_gap", "category_code"]
+# The columns (and order) make_features returns in backtest.py / hybrid_backtest.py
+MODEL_FEATURES = ["freq", "gap", "window_freq", "category_code"]
+
+
+def walk_forward_features(X, window=WINDOW, avg_gap=AVG_GAP, std_gap=STD_GAP):
+    """
+    Per-number features before every draw, from one pass over an N x K
+    incidence matrix. Returns a dict of (N+1) x K arrays where row i uses
+    draws [0, i) only, matching make_features(df.iloc[:i], n) column n-1:
+      freq          - hits so far
+      gap           - last hit index + 1 (i if never hit)
+      window_freq   - hits in the last `window` draws
+      mean_gap      - mean of the calculate_gaps-style gaps, i.e. last hit
+                      index / hits (i if never hit)
+      category_code - 2 hot (mean_gap < avg - std), 0 cold (> avg + std), else 1
+    """
+    X = np.asarray(X, dtype=bool)
+    n, k = X.shape
+    C = cumulative_counts(X).astype(np.int64)
+    freq = C
+    window_freq = C - C[np.maximum(np.arange(n + 1) - window, 0)]
+    # Index of the latest hit in rows [0, i), -1 if none
+    last = np.full((n + 1, k), -1, dtype=np.int64)
+    rows = np.where(X, np.arange(n, dtype=np.int64)[:, None], -1)
+    np.maximum.accumulate(rows, axis=0, out=last[1:])
+    prefix = np.broadcast_to(np.arange(n + 1, dtype=np.int64)[:, None], (n + 1, k))
+    hit = freq > 0
+    gap = np.where(hit, last + 1, prefix)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_gap = np.where(hit, last / freq, prefix.astype(np.float64))
+    category_code = np.where(mean_gap < (avg_gap - std_gap), 2, np.where(mean_gap > (avg_gap + std_gap), 0, 1))
+    return {"freq": freq, "gap": gap, "window_freq": window_freq,
+            "mean_gap": mean_gap, "category_code": category_code.astype(np.int64)}
+
+
+def feature_matrix(X, prefixes, names=MODEL_FEATURES, **kwargs):
+    """
+    Stacks the features for each prefix length i in prefixes into a
+    (len(prefixes) * K, F) array: rows ordered by prefix, then number, the
+    same order as looping make_features over (i, n) pairs.
+    """
+    features = walk_forward_features(X, **kwargs)
+    prefixes = np.asarray(list(prefixes), dtype=np.intp)
+    return np.stack([features[name][prefixes] for name in names], axis=-1).reshape(-1, len(names))
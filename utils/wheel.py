@@ -0,0 +1,217 @@
+# utils/wheel.py
+import time
+import numpy as np
+from utils.combinadic import all_combos
+from utils.game import HIT5
+
+CHUNK = 512
+
+
+def _masks(subsets, numbers):
+    """uint64 bitmask (bit n-1 = number n) of each row of 0-based indexes into numbers."""
+    values = np.asarray(numbers, dtype=np.uint64)[subsets]
+    masks = np.zeros(len(values), dtype=np.uint64)
+    for j in range(values.shape[1]):
+        masks |= np.uint64(1) << (values[:, j] - np.uint64(1))
+    return masks
+
+
+def _subset_masks(pool, size):
+    # Every size-subset of the pool, via the combinadic universe of 1..len(pool)
+    return _masks(all_combos(size, len(pool)).astype(np.intp) - 1, pool)
+
+
+def coverage_matrix(tickets, targets, guarantee):
+    """
+    Bit-packed (T, ceil(G / 64)) uint64 matrix: bit g of row i is set when
+    ticket mask i shares at least `guarantee` numbers with target mask g.
+    """
+    n_words = (len(targets) + 63) // 64
+    cover = np.zeros((len(tickets), n_words), dtype=np.uint64)
+    # About 4M ticket x target pairs per block
+    rows = max(1, (1 << 22) // max(1, len(targets)))
+    for start in range(0, len(tickets), rows):
+        block = tickets[start:start + rows, None] & targets[None, :]
+        hits = np.bitwise_count(block) >= guarantee
+        packed = np.packbits(hits, axis=1, bitorder='little')
+        packed = np.pad(packed, ((0, 0), (0, 8 * n_words - packed.shape[1])))
+        cover[start:start + len(hits)] = packed.view(np.uint64)
+    return cover
+
+
+def _all_bits(n):
+    words = np.full((n + 63) // 64, np.uint64(0xFFFFFFFFFFFFFFFF), dtype=np.uint64)
+    if n % 64:
+        words[-1] = np.uint64((1 << (n % 64)) - 1)
+    return words
+
+
+def greedy_cover(cover, n_targets, chosen=()):
+    """
+    Greedy set cover: starting from the chosen rows, repeatedly adds the row of
+    cover that covers the most still-uncovered targets. Returns the list of rows.
+    """
+    chosen = list(chosen)
+    uncovered = _all_bits(n_targets)
+    for i in chosen:
+        uncovered &= ~cover[i]
+    # Gains only shrink as targets get covered, so rows whose last gain is
+    # already below the best fresh gain never need recomputing this round
+    gains = np.bitwise_count(cover & uncovered).sum(axis=1, dtype=np.int64)
+    while uncovered.any():
+        order = np.argsort(-gains, kind='stable')
+        best, best_gain = -1, 0
+        for start in range(0, len(order), CHUNK):
+            rows = order[start:start + CHUNK]
+            if gains[rows[0]] <= best_gain:
+                break
+            fresh = np.bitwise_count(cover[rows] & uncovered).sum(axis=1, dtype=np.int64)
+            gains[rows] = fresh
+            k = int(np.argmax(fresh))
+            if fresh[k] > best_gain:
+                best, best_gain = int(rows[k]), int(fresh[k])
+        if best_gain == 0:
+            raise ValueError("targets cannot be covered by the candidate tickets")
+        chosen.append(best)
+        uncovered &= ~cover[best]
+        gains[best] = 0
+    return chosen
+
+
+def _unpack(row, n_targets):
+    return np.unpackbits(row.view(np.uint8), count=n_targets, bitorder='little').astype(bool)
+
+
+def _pack(bits, n_words):
+    packed = np.packbits(bits, bitorder='little')
+    return np.pad(packed, (0, 8 * n_words - len(packed))).view(np.uint64)
+
+
+def _cover_counts(cover, chosen, n_targets):
+    """How many chosen rows cover each target."""
+    bits = np.unpackbits(cover[chosen].view(np.uint8), axis=1, count=n_targets, bitorder='little')
+    return bits.sum(axis=0, dtype=np.int32)
+
+
+def prune(cover, chosen, n_targets):
+    """
+    Drops redundant rows: a row goes when every target it covers is also
+    covered by another kept row. Rows with the fewest sole-covered targets
+    are tried first. Returns the kept rows.
+    """
+    chosen = list(chosen)
+    counts = _cover_counts(cover, chosen, n_targets)
+    bits = {i: _unpack(cover[i], n_targets) for i in chosen}
+    for i in sorted(chosen, key=lambda i: int((counts[bits[i]] == 1).sum())):
+        if (counts[bits[i]] >= 2).all():
+            counts[bits[i]] -= 1
+            chosen.remove(i)
+    return chosen
+
+
+def _repair(cover, candidates, targets, guarantee, chosen, steps, rng, temperature, deadline=None):
+    """
+    Swap search for a cover of fixed size: pick an uncovered target and a
+    random chosen row, and replace the row by whichever candidate covering
+    that target loses the fewest targets net. Worse swaps are accepted with
+    probability exp(delta / T) while T cools. Returns the rows, or None if
+    targets are still uncovered after `steps` swaps or at the deadline.
+    """
+    n_targets, n_words = len(targets), cover.shape[1]
+    chosen = list(chosen)
+    counts = _cover_counts(cover, chosen, n_targets)
+    for step in range(steps):
+        missing = np.flatnonzero(counts == 0)
+        if not len(missing):
+            return chosen
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        zero, once = _pack(counts == 0, n_words), _pack(counts == 1, n_words)
+        u = missing[rng.integers(len(missing))]
+        options = np.flatnonzero(np.bitwise_count(candidates & targets[u]) >= guarantee)
+        k = rng.integers(len(chosen))
+        rows = cover[options]
+        # Targets newly covered minus targets only row k covered that the swap drops
+        delta = (np.bitwise_count(zero & rows).sum(axis=1, dtype=np.int64)
+                 - np.bitwise_count((once & cover[chosen[k]]) & ~rows).sum(axis=1, dtype=np.int64))
+        best = np.flatnonzero(delta == delta.max())
+        j = best[rng.integers(len(best))]
+        t = temperature * (1 - step / steps) + 0.05
+        if delta[j] >= 0 or rng.random() < np.exp(delta[j] / t):
+            counts[_unpack(cover[chosen[k]], n_targets)] -= 1
+            chosen[k] = int(options[j])
+            counts[_unpack(cover[chosen[k]], n_targets)] += 1
+    return chosen if (counts > 0).all() else None
+
+
+def local_search(cover, candidates, targets, guarantee, chosen, steps=5000, temperature=0.5,
+                 seed=0, time_limit=5.0):
+    """
+    Shrinks a complete cover one row at a time: drops the row that covers the
+    fewest targets on its own, repairs the hole with swap search and prunes.
+    Stops at the first failed repair or when time_limit seconds have passed;
+    returns the smallest complete cover found.
+    """
+    rng = np.random.default_rng(seed)
+    n_targets = len(targets)
+    best = list(chosen)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    while len(best) > 1 and (deadline is None or time.perf_counter() < deadline):
+        counts = _cover_counts(cover, best, n_targets)
+        sole = [int((counts[_unpack(cover[i], n_targets)] == 1).sum()) for i in best]
+        trial = best[:int(np.argmin(sole))] + best[int(np.argmin(sole)) + 1:]
+        repaired = _repair(cover, candidates, targets, guarantee, trial, steps, rng, temperature, deadline)
+        if repaired is None:
+            break
+        best = prune(cover, repaired, n_targets)
+    return best
+
+
+def uncovered_targets(tickets, pool, guarantee=3, if_match=None, game=HIT5):
+    """
+    Exhaustive coverage check: every if_match-subset of the pool (the winning
+    numbers that can land in it) is compared against every ticket by popcount.
+    Returns the (M, if_match) array of subsets that no ticket matches in at
+    least `guarantee` numbers; empty means the wheel is proven.
+    """
+    game.check_bitmask()
+    pool = sorted(pool)
+    if_match = game.picks if if_match is None else if_match
+    subsets = all_combos(if_match, len(pool)).astype(np.intp) - 1
+    targets = _masks(subsets, pool)
+    tickets = np.asarray(tickets, dtype=np.int64)
+    ticket_masks = _masks(tickets.reshape(-1, tickets.shape[-1]) - 1, np.arange(1, game.max_number + 1))
+    covered = np.zeros(len(targets), dtype=bool)
+    rows = max(1, (1 << 22) // max(1, len(targets)))
+    for start in range(0, len(ticket_masks), rows):
+        block = ticket_masks[start:start + rows, None] & targets[None, :]
+        covered |= (np.bitwise_count(block) >= guarantee).any(axis=0)
+    return np.asarray(pool)[subsets[~covered]]
+
+
+def wheel(pool, guarantee=3, if_match=None, game=HIT5, seed=0, time_limit=5.0):
+    """
+    Builds a small ticket set (covering design) over the pool: whenever
+    if_match of the winning numbers (default: all picks) are in the pool, at
+    least one ticket matches `guarantee` of them. Greedy set cover on ticket
+    and target bitmasks, then local search for up to time_limit seconds
+    (0 for greedy only), then an exhaustive check. Returns a list of sorted
+    ticket tuples.
+    """
+    game.check_bitmask()
+    pool = sorted(int(n) for n in pool)
+    if_match = game.picks if if_match is None else if_match
+    if not guarantee <= min(if_match, game.picks) or if_match > len(pool) or game.picks > len(pool):
+        raise ValueError(f"cannot guarantee {guarantee}-if-{if_match} with {game.picks}-number tickets from {len(pool)} numbers")
+    candidates = all_combos(game.picks, len(pool)).astype(np.intp) - 1
+    targets = _subset_masks(pool, if_match)
+    candidate_masks = _masks(candidates, pool)
+    cover = coverage_matrix(candidate_masks, targets, guarantee)
+    chosen = prune(cover, greedy_cover(cover, len(targets)), len(targets))
+    if time_limit:
+        chosen = local_search(cover, candidate_masks, targets, guarantee, chosen, seed=seed, time_limit=time_limit)
+    tickets = [tuple(pool[i] for i in candidates[row]) for row in sorted(chosen)]
+    missed = uncovered_targets(tickets, pool, guarantee, if_match, game)
+    if len(missed):
+        raise RuntimeError(f"wheel misses {len(missed)} targets")
+    return tickets
@@ -0,0 +1,37 @@
+# utils/window_counts.py
+import numpy as np
+
+
+def cumulative_counts(X):
+    """
+    Builds the (N+1) x K prefix-sum matrix of an N x K indicator matrix
+    (e.g. utils.incidence.incidence_matrix): C[i] holds the hit counts of
+    rows [0, i), so any window [start, end) is C[end] - C[start].
+    """
+    X = np.asarray(X)
+    C = np.zeros((X.shape[0] + 1,) + X.shape[1:], dtype=np.int32)
+    np.cumsum(X, axis=0, out=C[1:])
+    return C
+
+
+def window_frequency(C, start, end):
+    """Hit counts per column for rows [start, end)."""
+    return C[end] - C[start]
+
+
+def batch_window_frequency(C, starts, ends):
+    """
+    Hit counts for many windows at once: returns a (W, K) array whose row w
+    is the count over rows [starts[w], ends[w]).
+    """
+    return C[np.asarray(ends)] - C[np.asarray(starts)]
+
+
+def rolling_frequency(C, window):
+    """
+    Rolling hit counts over the last `window` rows ending at each row
+    (shorter at the start, like pandas rolling(window, min_periods=1).sum()).
+    Returns an N x K array.
+    """
+    ends = np.arange(1, C.shape[0])
+    return batch_window_frequency(C, np.maximum(ends - window, 0), ends)